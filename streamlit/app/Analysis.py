@@ -1,6 +1,13 @@
 import streamlit as st
 import pandas as pd
-import re
+import matplotlib.pyplot as plt
+import numpy as np
+
+from cooccurrence import clustered_matrix, compute_cooccurrence, related_skills, skill_counts, skill_matrix
+from facets import experience_codes
+from geocoding import GeocodeCache, build_network_geocoder, geocode_cities, load_gazetteer
+from normalize import EXPERIENCE_LABELS, extract_city
+from offer_store import MISSING, as_numpy
 
 st.title("Data Analysis")
 
@@ -9,72 +16,59 @@ if "all_offers" not in st.session_state or not st.session_state.all_offers:
     st.info("No data available. Please run the data collection first.")
     st.stop()
 
-df = pd.DataFrame(st.session_state.all_offers)
+store = st.session_state.all_offers
 
 # Overview & general info
 with st.expander("🔍 Data Overview", expanded=True):
-    st.write(f"Total number of job offers: **{len(df)}**")
-    st.dataframe(df.head(20), use_container_width=True)
+    st.write(f"Total number of job offers: **{len(store)}**")
+    st.dataframe(store.to_dataframe(np.arange(min(20, len(store)))), use_container_width=True)
     st.download_button(
         "Download data (CSV)",
-        df.to_csv(index=False),
+        # Generated on click, not on every rerun
+        lambda: store.to_dataframe().to_csv(index=False),
         "job_offers.csv",
         "text/csv"
     )
 
-# Check required columns
-required_cols = {"hard_skills", "soft_skills"}
-missing_cols = required_cols - set(df.columns)
-if missing_cols:
-    st.warning(f"Missing columns for analysis: {', '.join(missing_cols)}")
-    st.stop()
-
-def to_list(x):
-    """Accepts list, string 'a,b;c|d', otherwise returns []"""
-    if isinstance(x, list):
-        return x
-    if isinstance(x, str):
-        parts = re.split(r"[;,|]", x)
-        return [p.strip() for p in parts if p.strip()]
-    return []
-
-def clean_skill(s: str) -> str:
-    """Light cleaning: trim + lower + collapse spaces"""
-    s = str(s).strip().lower()
-    s = re.sub(r"\s+", " ", s)
-    return s
-
-def parse_years(x):
-    """Extracts first number from '6 years', '3 yrs', etc."""
-    if pd.isna(x):
-        return None
-    m = re.search(r"(\d+)", str(x))
-    return int(m.group(1)) if m else None
-
-# Light cleaning (robustness)
-df["hard_skills"] = df["hard_skills"].apply(to_list).apply(
-    lambda lst: [clean_skill(x) for x in lst if str(x).strip()]
-)
-df["soft_skills"] = df["soft_skills"].apply(to_list).apply(
-    lambda lst: [clean_skill(x) for x in lst if str(x).strip()]
+@st.cache_resource
+def get_gazetteer():
+    """Offline communes gazetteer, loaded once per process."""
+    return load_gazetteer()
+
+@st.cache_resource(max_entries=8)
+def get_skill_matrix(_store, version_key: str, field: str):
+    """Binary offer x cleaned-skill matrix, built once per dataset version and skill field."""
+    return skill_matrix(_store, field)
+
+@st.cache_resource(max_entries=8)
+def get_cooccurrence(_store, version_key: str, field: str):
+    """Sparse X^T X statistics, computed once per dataset version and skill field."""
+    return compute_cooccurrence(_store, field)
+
+@st.cache_resource
+def get_network_geocoder():
+    """Rate-limited network geocoder, shared by all sessions."""
+    return build_network_geocoder()
+
+# Per-offer arrays straight from the store: reruns (widget changes) only count and render
+years = as_numpy(store.years)
+exp_codes = experience_codes(years)
+city_of_location = np.array(
+    [extract_city(v) or "" for v in store.vocabularies["location"].values] + [""], dtype=object
 )
-
-# Experience (if available)
-has_exp = "years_experience_min" in df.columns
-if has_exp:
-    df["years_num"] = df["years_experience_min"].apply(parse_years)
+# MISSING (-1) location codes index the trailing ""
+offer_cities = city_of_location[as_numpy(store.codes["location"])]
 
 # User parameters
 top_n = st.slider("Number of skills to display", 5, 50, 20, 5)
 
 # Tabs for clear reading (+ Experience + Cities)
-tab_hard, tab_soft, tab_exp, tab_city = st.tabs(
-    ["🛠 Hard Skills", "🧠 Soft Skills", "📈 Experience", "🏙️ Cities"]
+tab_hard, tab_soft, tab_cooc, tab_exp, tab_city = st.tabs(
+    ["🛠 Hard Skills", "🧠 Soft Skills", "🔗 Co-occurrence", "📈 Experience", "🏙️ Cities"]
 )
 
 with tab_hard:
-    hard_freq = df["hard_skills"].explode().dropna()
-    hard_freq = hard_freq[hard_freq != ""].value_counts().head(top_n)
+    hard_freq = skill_counts(*get_skill_matrix(store, store.version_key, "hard_skills")).head(top_n)
 
     if hard_freq.empty:
         st.warning("No usable hard skills found.")
@@ -90,8 +84,7 @@ with tab_hard:
         )
 
 with tab_soft:
-    soft_freq = df["soft_skills"].explode().dropna()
-    soft_freq = soft_freq[soft_freq != ""].value_counts().head(top_n)
+    soft_freq = skill_counts(*get_skill_matrix(store, store.version_key, "soft_skills")).head(top_n)
 
     if soft_freq.empty:
         st.warning("No usable soft skills found.")
@@ -106,12 +99,72 @@ with tab_soft:
             use_container_width=True,
         )
 
-with tab_exp:
-    if not has_exp:
-        st.info("Column 'years_experience_min' not found → no experience analysis.")
-        st.stop()
+with tab_cooc:
+    st.subheader("Skills that go together")
+
+    field_label = st.radio("Skill type", ["Hard skills", "Soft skills"], horizontal=True)
+    field = "hard_skills" if field_label == "Hard skills" else "soft_skills"
+    co = get_cooccurrence(store, store.version_key, field)
+
+    if len(co.labels) < 2:
+        st.warning("Not enough distinct skills for a co-occurrence analysis.")
+    else:
+        # Most frequent skills first in the selector
+        by_frequency = co.labels[np.argsort(-co.counts, kind="stable")]
+        skill = st.selectbox("Skill", by_frequency)
+        min_together = st.number_input(
+            "Minimum number of offers where both skills appear",
+            min_value=1,
+            value=2,
+            step=1,
+        )
 
-    exp_series = df["years_num"].dropna()
+        related = related_skills(co, skill, min_together=int(min_together), top=top_n)
+        if related.empty:
+            st.info("No associated skill with this minimum support.")
+        else:
+            st.write(
+                f"Skills most associated with **{skill}** "
+                f"(mentioned in {int(co.counts[np.searchsorted(co.labels, skill)])} job offers). "
+                "Lift > 1: the pair appears together more often than by chance."
+            )
+            st.dataframe(
+                related.style.format({"Confidence": "{:.0%}", "Lift": "{:.2f}", "PMI": "{:.2f}"}),
+                use_container_width=True,
+            )
+
+        st.divider()
+
+        st.subheader("Skill clusters")
+        metric = st.radio("Score", ["PMI", "Lift"], horizontal=True)
+        if len(co.labels) == 2:
+            # A slider needs min < max
+            top_k = 2
+        else:
+            top_k = st.slider(
+                "Number of skills in the heatmap",
+                min_value=2,
+                max_value=min(60, len(co.labels)),
+                value=min(25, len(co.labels)),
+            )
+        heatmap = clustered_matrix(co, top_k=top_k, metric=metric)
+
+        fig, ax = plt.subplots(figsize=(0.35 * top_k + 3, 0.35 * top_k + 2))
+        values = heatmap.to_numpy()
+        if metric == "PMI":
+            bound = np.nanmax(np.abs(values)) if np.isfinite(values).any() else 1.0
+            im = ax.imshow(values, cmap="RdBu_r", vmin=-bound, vmax=bound)
+        else:
+            im = ax.imshow(values, cmap="viridis")
+        ax.set_xticks(range(len(heatmap.columns)), heatmap.columns, rotation=90)
+        ax.set_yticks(range(len(heatmap.index)), heatmap.index)
+        fig.colorbar(im, ax=ax, label=metric)
+        fig.tight_layout()
+        st.pyplot(fig)
+        plt.close(fig)
+
+with tab_exp:
+    exp_series = pd.Series(years[years != MISSING], name="years_num")
     if exp_series.empty:
         st.warning("Unable to extract years of experience.")
         st.stop()
@@ -129,31 +182,26 @@ with tab_exp:
 
     st.divider()
 
-    bins = [0, 2, 4, 6, 9, 50]
-    labels = ["0-2", "3-4", "5-6", "7-9", "10+"]
-
-    df_exp = df.dropna(subset=["years_num"]).copy()
-    df_exp["exp_bucket"] = pd.cut(
-        df_exp["years_num"], bins=bins, labels=labels, include_lowest=True
-    )
+    labels = EXPERIENCE_LABELS
 
     st.subheader("Hard skills by experience level")
     bucket = st.selectbox("Select an experience range", labels, index=1)
 
-    df_bucket = df_exp[df_exp["exp_bucket"] == bucket]
+    in_bucket = exp_codes == labels.index(bucket)
 
-    if df_bucket.empty:
+    if not in_bucket.any():
         st.warning("No job offers in this range.")
     else:
-        bucket_freq = df_bucket["hard_skills"].explode().dropna()
-        bucket_freq = bucket_freq[bucket_freq != ""].value_counts().head(top_n)
+        bucket_freq = skill_counts(
+            *get_skill_matrix(store, store.version_key, "hard_skills"), rows=in_bucket
+        ).head(top_n)
 
         if bucket_freq.empty:
             st.warning("No usable hard skills in this range.")
         else:
             st.write(
                 f"Top hard skills for **{bucket} years** "
-                f"(based on {len(df_bucket)} job offers)"
+                f"(based on {int(in_bucket.sum())} job offers)"
             )
             st.bar_chart(bucket_freq)
 
@@ -174,20 +222,21 @@ with tab_exp:
         key="soft_exp_bucket",
     )
 
-    df_bucket = df_exp[df_exp["exp_bucket"] == bucket]
+    in_bucket = exp_codes == labels.index(bucket)
 
-    if df_bucket.empty:
+    if not in_bucket.any():
         st.warning("No job offers in this range.")
     else:
-        bucket_freq = df_bucket["soft_skills"].explode().dropna()
-        bucket_freq = bucket_freq[bucket_freq != ""].value_counts().head(top_n)
+        bucket_freq = skill_counts(
+            *get_skill_matrix(store, store.version_key, "soft_skills"), rows=in_bucket
+        ).head(top_n)
 
         if bucket_freq.empty:
             st.warning("No usable soft skills in this range.")
         else:
             st.write(
                 f"Top soft skills for **{bucket} years** "
-                f"(based on {len(df_bucket)} job offers)"
+                f"(based on {int(in_bucket.sum())} job offers)"
             )
             st.bar_chart(bucket_freq)
 
@@ -201,35 +250,7 @@ with tab_exp:
 with tab_city:
     st.subheader("Top mentioned cities")
 
-    if "location" not in df.columns:
-        st.info("Column 'location' not found → no city analysis.")
-        st.stop()
-
-    def extract_city(loc: str):
-        if not isinstance(loc, str) or not loc.strip():
-            return None
-
-        loc = loc.strip()
-
-        # HelloWork real separator: " - "
-        if " - " in loc:
-            loc = loc.split(" - ")[0].strip()
-
-        # Remove district numbers / suffixes
-        loc = re.sub(r"\s+\d+(e|er)?$", "", loc, flags=re.IGNORECASE)
-
-        # Final cleanup: letters, accents, spaces, apostrophes, hyphens
-        m = re.match(r"^[A-Za-zÀ-ÿ'\-\s]+$", loc)
-        if not m:
-            return None
-
-        return loc.strip() if loc.strip() else None
-
-    df_loc = df[["location"]].copy()
-    df_loc["city"] = df_loc["location"].apply(extract_city)
-
-    city_counts = df_loc["city"].dropna()
-    city_counts = city_counts[city_counts != ""].value_counts()
+    city_counts = pd.Series(offer_cities[offer_cities != ""], name="city").value_counts()
 
     if city_counts.empty:
         st.warning("No usable locations found.")
@@ -249,6 +270,7 @@ with tab_city:
             step=1,
         )
 
+    all_city_counts = city_counts
     city_counts = city_counts.head(top_cities)
 
     st.bar_chart(city_counts)
@@ -259,3 +281,40 @@ with tab_city:
         ),
         use_container_width=True,
     )
+
+    st.divider()
+
+    st.subheader("Job offers map")
+
+    # Distinct cities only: a 100k-offer session has a few hundred cities at most
+    use_network = st.checkbox(
+        "Use online geocoder for cities missing from the offline gazetteer",
+        value=False,
+        help="Rate-limited (1 request/s); results are cached on disk.",
+    )
+
+    gazetteer = get_gazetteer()
+    coords = geocode_cities(
+        all_city_counts.index,
+        gazetteer,
+        GeocodeCache(),
+        geocoder=get_network_geocoder() if use_network else None,
+    )
+
+    df_map = pd.DataFrame({"city": all_city_counts.index, "offers": all_city_counts.values})
+    df_map["lat"] = df_map["city"].map(lambda c: coords[c][0] if coords.get(c) else None)
+    df_map["lon"] = df_map["city"].map(lambda c: coords[c][1] if coords.get(c) else None)
+    df_map = df_map.dropna(subset=["lat", "lon"])
+
+    unresolved = len(all_city_counts) - len(df_map)
+    if not gazetteer:
+        st.caption("Offline gazetteer not found (data/communes.csv).")
+    if unresolved:
+        st.caption(f"{unresolved} city name(s) could not be located.")
+
+    if df_map.empty:
+        st.warning("No city could be located.")
+    else:
+        # Marker radius (meters) grows with the square root of the offer count
+        df_map["size"] = 2000 + 1500 * df_map["offers"] ** 0.5
+        st.map(df_map, latitude="lat", longitude="lon", size="size")
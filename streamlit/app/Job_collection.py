@@ -1,60 +1,40 @@
-import os
 import streamlit as st
 import time
-import httpx
-import json
-from urllib.parse import urlencode, quote_plus, urljoin
-from bs4 import BeautifulSoup
-from datetime import date, timedelta
-from typing import Optional, Dict, List, Tuple
-import re
-import google.generativeai as genai
-from dotenv import load_dotenv
+from urllib.parse import urlencode, quote_plus
+from typing import Optional, Dict, List
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
+
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+from resources import (
+    STARTUP_TIMINGS,
+    MissingApiKey,
+    get_model,
+    get_page_archive,
+    get_parse_pool,
+    get_proxy_pool,
+    timed_import,
+)
+
+# Cached in sys.modules after the first run: only the first import is slow (and measured)
+httpx = timed_import("httpx")
+timed_import("bs4")
+
+from checkpoint import CheckpointInUse, CollectionCheckpoint, is_active, list_checkpoints, search_key
+from extraction import empty_result, llm_extract
+from page_archive import PageArchive
+from parse_pool import ParsePool
+from parsing import BASE_URL
+from offer_store import OfferStore
+from proxy_pool import EgressBlocked, NoHealthyEgress, ProxyPool, is_egress_failure
+from relevance import DEFAULT_SCORER, DEFAULT_THRESHOLD, SCORERS, filter_relevant
+from text_budget import DEFAULT_TOKEN_BUDGET, prepare_offer_text
+from rollups import ingest_offers
 
 # Configuration constants
 MAX_PAGE_HARDCAP = 500
-BASE_URL = "https://www.hellowork.com"
 SEARCH_PATH = "/fr-fr/emploi/recherche.html"
-load_dotenv()
-api_key = os.getenv("GENAI_API_KEY")
-if not api_key:
-    raise RuntimeError("Missing GEMINI_API_KEY (environment variable).")
-
-DEFAULT_HEADERS = {
-    "User-Agent": (
-        "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
-        "(KHTML, like Gecko) Chrome/120.0 Safari/537.36"
-    ),
-    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-    "Accept-Language": "fr-FR,fr;q=0.9,en;q=0.8",
-    "Accept-Encoding": "gzip, deflate",
-}
-
-genai.configure(api_key=api_key)
-MODEL = genai.GenerativeModel("gemini-2.5-flash-lite")
-
-def prompt_gemini(job_offer: str) -> str:
-    return f"""
-    You are an information extractor for job offers.
-    Reply ONLY with valid JSON. No markdown. No extra text.
-
-    Constraints:
-    - Do not invent anything.
-    - If missing: null or [].
-    - Deduplicate, trim, normalize (same casing).
-    - Follow EXACTLY the keys below.
-
-    Expected JSON:
-    {{
-    "hard_skills": [],
-    "soft_skills": [],
-    "years_experience_min": null,
-    "domains": []
-    }}
-
-    Text:
-    \"\"\"{job_offer}\"\"\"
-    """.strip()
 
 def build_search_url(job: str, country: str, contract_type: str = "") -> str:
     """
@@ -78,170 +58,60 @@ def build_search_url(job: str, country: str, contract_type: str = "") -> str:
     query = urlencode(query_params, quote_via=quote_plus)
     return f"{BASE_URL}{SEARCH_PATH}?{query}"
 
-def extract_text(
-    parent: BeautifulSoup,
-    name: str,
-    class_name: Optional[str] = None,
-    attrs: Optional[Dict[str, str]] = None,
-) -> Optional[str]:
-    """
-    Extracts cleaned text from an HTML element.
-    Returns None if not found.
-    """
-    attrs = attrs or {}
-    elem = parent.find(name, class_=class_name, attrs=attrs)
-    return elem.get_text(strip=True) if elem else None
-
-def parse_relative_date(date_string: str) -> date:
-    days = re.findall(r"\d+", date_string)
-    return date.today() - timedelta(days=int(days[0])) if days else date.today()
-
-def parse_last_page(soup: BeautifulSoup) -> int:
+def fetch_html(url: str, pool: ProxyPool, archive: Optional[PageArchive] = None) -> Dict:
     """
-    Gets the last page number from pagination.
-    Returns 1 by default if nothing is found.
+    Downloads an HTML page through the egress pool (archived raw if an archive is given).
     """
-    nav = soup.find(
-        "nav",
-        class_="tw-hidden sm:tw-flex tw-gap-2 tw-typo-m tw-flex-wrap",
-    )
-    if not nav:
-        return 1
-
-    buttons = nav.find_all("button")
-    number_buttons = [b for b in buttons if b.text.strip().isdigit()]
-    if not number_buttons:
-        return 1
-
-    last_button = number_buttons[-1]
-    return int(last_button.get_text(strip=True))
+    r = pool.get(url)
+    content = r.content or b""
+    if archive is not None and content:
+        archive.append(url, content, "listing", r.status_code)
+
+    return {
+        "ok": (r.status_code == 200 and len(content) > 0),
+        "status_code": r.status_code,
+        "final_url": str(r.url),
+        "content_length": len(content),
+        "content_type": r.headers.get("content-type"),
+        "headers_sample": {
+            k: v
+            for k, v in r.headers.items()
+            if k.lower()
+            in ["server", "location", "set-cookie", "cf-ray", "cf-cache-status", "retry-after"]
+        },
+        "html": content.decode(errors="replace"),
+    }
 
-def extraction_offers_from_html(html: str) -> Tuple[List[Dict[str, Optional[str]]], int]:
+def fetch_job_page(url: str, pool: ProxyPool, archive: Optional[PageArchive] = None) -> Optional[bytes]:
     """
-    Extracts the list of offers + total number of pages from a HelloWork HTML page.
+    Downloads an offer page (archived raw for reextract.py).
+    Returns None if the page is unusable (404/410, empty page); network errors and
+    blocked-exit responses (EgressBlocked) are raised, so the offer is retried on resume.
     """
-    soup = BeautifulSoup(html, "html.parser")
-    offers: List[Dict[str, Optional[str]]] = []
-
-    # Total number of pages
-    last_page = parse_last_page(soup)
-
-    # Offers list
-    offer_ul_list = soup.select('ul[aria-label="liste des offres"]')
-    if not offer_ul_list:
-        return offers, last_page
-
-    offer_ul = offer_ul_list[0]
-    for li in offer_ul.find_all("li", recursive=False):
-        offer_link = li.select_one('a[data-cy="offerTitle"]')
-        href = offer_link.get("href", "") if offer_link else ""
-        url = urljoin(BASE_URL, href) if href else None
-
-        title = extract_text(
-            li,
-            "p",
-            "tw-typo-l sm:small-group:tw-typo-l sm:tw-typo-xl",
-        )
-
-        published_date = (
-            parse_relative_date(
-                extract_text(
-                    li,
-                    "div",
-                    "tw-typo-s tw-text-grey-500 tw-pl-1 tw-pt-1",
-                )
-            )
-            if extract_text(
-                li,
-                "div",
-                "tw-typo-s tw-text-grey-500 tw-pl-1 tw-pt-1",
-            )
-            else None
-        )
-
-        contract_type = extract_text(
-            li,
-            "div",
-            "tw-readonly tw-tag-secondary-s tw-w-fit tw-border-0",
-            attrs={"data-cy": "contractCard"},
-        )
-        location = extract_text(
-            li,
-            "div",
-            "tw-readonly tw-tag-secondary-s tw-w-fit tw-border-0",
-            attrs={"data-cy": "localisationCard"},
-        )
-        company = extract_text(li, "p", "tw-typo-s tw-inline")
-
-        offers.append(
-            {
-                "title": title,
-                "date": published_date,
-                "url": url,
-                "contract_type": contract_type,
-                "location": location,
-                "company": company,
-            }
-        )
-
-    return offers, last_page
-
-def fetch_html(url: str) -> Dict:
+    r = pool.get(url)
+    if is_egress_failure(r.status_code):
+        raise EgressBlocked(url, r.status_code)
+    if r.status_code != 200 or not r.content:
+        return None
+
+    if archive is not None:
+        archive.append(url, r.content, "detail", r.status_code)
+    return r.content
+
+def extract_text_from_job(
+    url: str,
+    page: Dict[str, Optional[str]],
+    job: str,
+    token_budget: int = DEFAULT_TOKEN_BUDGET,
+) -> Dict[str, Optional[str]]:
     """
-    Downloads an HTML page.
+    Skills extraction from a parsed offer page (mission, profile, experience).
+    Gemini API errors (quota, network) are raised, so the offer is retried on resume.
     """
-    with httpx.Client(
-        timeout=20,
-        follow_redirects=True,
-        headers=DEFAULT_HEADERS,
-    ) as client:
-        r = client.get(url)
-        content = r.content or b""
-
-        return {
-            "ok": (r.status_code == 200 and len(content) > 0),
-            "status_code": r.status_code,
-            "final_url": str(r.url),
-            "content_length": len(content),
-            "content_type": r.headers.get("content-type"),
-            "headers_sample": {
-                k: v
-                for k, v in r.headers.items()
-                if k.lower()
-                in ["server", "location", "set-cookie", "cf-ray", "cf-cache-status", "retry-after"]
-            },
-            "html": content.decode(errors="replace"),
-        }
-
-def extract_text_from_job(url: str, client: httpx.Client) -> Dict[str, Optional[str]]:
     try:
-        r = client.get(url, timeout=20, headers=DEFAULT_HEADERS)
-        if r.status_code != 200 or not r.content:
-            return {
-                "hard_skills": [],
-                "soft_skills": [],
-                "years_experience_min": None,
-                "domains": [],
-            }
-
-        soup = BeautifulSoup(r.text, "html.parser")
-
-        mission_text = extract_text(
-            soup,
-            "div",
-            class_name="tw-leading-relaxed",
-            attrs={"data-truncate-text-target": True},
-        )
-
-        profil_recherche = extract_text(
-            soup,
-            "p",
-            "tw-typo-long-m tw-break-words",
-        )
-
-        ul = soup.select_one("ul.tw-flex.tw-flex-wrap.tw-gap-3")
-        experience = ul.find_all("li", recursive=False)[-1].get_text(strip=True) if ul else None
-        experience_years = re.findall(r"\d+", experience)[0] if experience and "Exp." in experience else None
+        mission_text = page["mission"]
+        profil_recherche = page["profile"]
+        experience_years = page["experience_years"]
 
         # Build the text to analyze
         if mission_text and profil_recherche:
@@ -258,152 +128,180 @@ def extract_text_from_job(url: str, client: httpx.Client) -> Dict[str, Optional[
                 "domains": None,
             }
 
-        if metier.lower() not in job_offer.lower():
-            return {
-                "hard_skills": [],
-                "soft_skills": [],
-                "years_experience_min": None,
-                "domains": [],
-            }
-
-        for _ in range(5):
-            prompt = prompt_gemini(job_offer)
-
-            # Gemini call
-            result = MODEL.generate_content(
-                prompt,
-                generation_config={"response_mime_type": "application/json"},
-            )
-
-            # Parse JSON response
-            try:
-                data = json.loads(result.text)
-                if (
-                    "hard_skills" not in data
-                    or "soft_skills" not in data
-                    or "years_experience_min" not in data
-                    or "domains" not in data
-                ):
-                    st.warning(
-                        f"Missing fields in response for offer {url}. Attempt {_+1}/5."
-                    )
-                    continue
-
-                data["hard_skills"] = sorted(data["hard_skills"], key=str.lower)
-                data["soft_skills"] = sorted(data["soft_skills"], key=str.lower)
-                data["years_experience_min"] = (
-                    int(data["years_experience_min"])
-                    if data["years_experience_min"] is not None
-                    else experience_years
-                )
-                return data
-            except json.JSONDecodeError:
-                continue
+        if job.lower() not in job_offer.lower():
+            return empty_result()
 
-        st.warning(f"Extraction failed after 5 attempts for offer {url}.")
-        return {
-            "hard_skills": [],
-            "soft_skills": [],
-            "years_experience_min": None,
-            "domains": [],
-        }
+        # Boilerplate-free, skill-bearing text within the token budget
+        llm_text, token_stats = prepare_offer_text(mission_text, profil_recherche, token_budget)
 
     except Exception as e:
         st.warning(f"Error in extract_text_from_job: {e}")
-        return {
-            "hard_skills": [],
-            "soft_skills": [],
-            "years_experience_min": None,
-            "domains": [],
-        }
+        return empty_result()
+
+    data = llm_extract(get_model(), llm_text, experience_years, url, warn=st.warning)
+    if data is None:
+        return empty_result()
+
+    data["tokens_saved"] = token_stats["tokens_saved"]
+    data["skill_tokens_dropped"] = token_stats["skill_tokens_dropped"]
+    return data
 
 def enrich_offers(
-    client: httpx.Client,
+    pool: ProxyPool,
+    parse_pool: ParsePool,
     offers: List[Dict[str, Optional[str]]],
+    job: str,
     max_num_of_offers: int,
+    checkpoint: CollectionCheckpoint,
+    token_budget: int,
+    run_stats: Dict[str, int],
+    archive: Optional[PageArchive],
     status_box,
     bar,
 ) -> List[Dict[str, Optional[str]]]:
+    """
+    Three stages per batch:
+    1) fetch offer pages concurrently, one thread per available egress slot
+    2) parse them in the process pool (chunked)
+    3) run the LLM extraction concurrently
+    Results are handled (checkpoint, progress) on the script thread.
+    """
     results = []
 
-    for i, offer in enumerate(offers):
-        url = offer.get("url")
-        if not url:
-            continue
+    # Already processed before an interruption: no network or LLM work
+    pending = [
+        offer
+        for offer in offers
+        if offer.get("url") and offer["url"] not in checkpoint.seen_urls
+    ]
+    if not pending:
+        return results
+
+    # Worker threads need the script context to display st.warning messages
+    ctx = get_script_run_ctx()
+    with ThreadPoolExecutor(
+        max_workers=min(pool.max_workers, len(pending)),
+        initializer=lambda: add_script_run_ctx(threading.current_thread(), ctx),
+    ) as executor:
+        fetch_futures = {
+            executor.submit(fetch_job_page, offer["url"], pool, archive): offer
+            for offer in pending
+        }
 
-        data = extract_text_from_job(url, client)
-        if data["hard_skills"] == [] and data["soft_skills"] == []:
-            continue
+        fetched = []
+        for future in as_completed(fetch_futures):
+            offer = fetch_futures[future]
+            url = offer["url"]
+            try:
+                content = future.result()
+            except (httpx.TransportError, EgressBlocked, NoHealthyEgress) as e:
+                # Not recorded in the checkpoint: fetched again on resume
+                st.warning(f"Network error for offer {url}: {e}")
+                run_stats["network_failures"] += 1
+                continue
+            except httpx.HTTPError as e:
+                # Redirect loop, undecodable body: a problem with the page itself
+                st.warning(f"Unusable page for offer {url}: {e}")
+                checkpoint.record_offer(url, None)
+                continue
 
-        enriched = {**offer, **data}
-        results.append(enriched)
+            if content is None:
+                checkpoint.record_offer(url, None)
+                continue
+            fetched.append((offer, content))
 
-        status_box.write(
-            f"Processing offer {i + len(st.session_state.all_offers) + 1}/{max_num_of_offers}..."
-        )
-        bar.progress((i + len(st.session_state.all_offers) + 1) / max_num_of_offers)
+        status_box.write(f"Parsing {len(fetched)} offer pages…")
+        pages = parse_pool.parse_details([content for _, content in fetched])
 
-    return results
+        futures = {
+            executor.submit(
+                extract_text_from_job, offer["url"], page, job, token_budget
+            ): offer
+            for (offer, _), page in zip(fetched, pages)
+        }
 
+        for i, future in enumerate(as_completed(futures)):
+            offer = futures[future]
+            url = offer["url"]
+            try:
+                data = future.result()
+            except Exception as e:
+                # Gemini quota / API error: not recorded, so resume sends it again
+                st.warning(f"LLM extraction failed for offer {url}: {e}")
+                run_stats["llm_failures"] += 1
+                continue
 
-st.title("Job Collection")
+            tokens_saved = data.pop("tokens_saved", None)
+            skill_tokens_dropped = data.pop("skill_tokens_dropped", 0)
+            if tokens_saved is not None:
+                run_stats["llm_offers"] += 1
+                run_stats["tokens_saved"] += tokens_saved
+                run_stats["skill_tokens_dropped"] += skill_tokens_dropped
+            if data["hard_skills"] == [] and data["soft_skills"] == []:
+                checkpoint.record_offer(url, None)
+                continue
 
-metier = st.text_input(
-    "Job title or skill:",
-    placeholder="e.g., Data Scientist, Python, Marketing...",
-)
-pays = st.text_input(
-    "Location:",
-    placeholder="France, Germany, Spain...",
-)
-contrat_type = st.selectbox(
-    "Contract type (optional):",
-    options=[
-        "",
-        "CDI",
-        "CDD",
-        "Intérim",
-        "Stage",
-        "Alternance",
-        "Freelance",
-    ],
-)
-max_num_of_offers = st.number_input(
-    "Maximum number of job offers to fetch:",
-    step=1,
-    min_value=1,
-    max_value=1000,
-)
+            enriched = {**offer, **data}
+            results.append(enriched)
+            checkpoint.record_offer(url, enriched)
+
+            status_box.write(
+                f"Processing offer {i + len(st.session_state.all_offers) + 1}/{max_num_of_offers}..."
+                + (f" ({tokens_saved} input tokens saved)" if tokens_saved else "")
+            )
+            bar.progress(min(1.0, (i + len(st.session_state.all_offers) + 1) / max_num_of_offers))
+
+    return results
 
-if st.button("Start search"):
-    st.session_state.all_offers = []
+def run_collection(checkpoint: CollectionCheckpoint) -> None:
+    """
+    Scrapes and enriches offers from the checkpoint's next page onwards.
+    The checkpoint is deleted when the run completes and kept when it is interrupted.
+    """
+    params = checkpoint.params
+    job = params["job"]
+    max_num_of_offers = params["max_offers"]
     time_start = time.time()
 
     # Build search URL
-    search_url = build_search_url(metier, pays, contrat_type)
+    search_url = build_search_url(job, params["location"], params["contract_type"])
 
     # Loop variables
-    last_page_global = None
+    last_page_global = checkpoint.last_page
+    completed = True
 
     progress_box = st.empty()
     status_box = st.empty()
 
+    pool = get_proxy_pool()
+    archive = get_page_archive()
+    parse_pool = get_parse_pool()
+    if len(pool.egresses) > 1:
+        health = pool.health_check()
+        st.caption(
+            f"Egress pool: {sum(health.values())}/{len(health)} healthy exit(s)."
+        )
+
     # Loop through HelloWork pages until the end
     pages_processed = 0
+    skipped_total = 0
+    token_budget = params.get("token_budget", DEFAULT_TOKEN_BUDGET)
+    run_stats = {"llm_offers": 0, "tokens_saved": 0, "skill_tokens_dropped": 0, "network_failures": 0, "llm_failures": 0}
 
-    for page in range(1, MAX_PAGE_HARDCAP + 1):
+    for page in range(checkpoint.next_page, MAX_PAGE_HARDCAP + 1):
         paginated_url = f"{search_url}&p={page}"
 
         try:
-            result_html = fetch_html(paginated_url)
+            result_html = fetch_html(paginated_url, pool, archive)
             if not result_html["ok"]:
                 st.warning(
                     f"Page {page} could not be retrieved (status={result_html['status_code']}). Stopping."
                 )
                 st.json({k: v for k, v in result_html.items() if k != "html"})
+                completed = False
                 break
 
-            offers, detected_last_page = extraction_offers_from_html(result_html["html"])
+            offers, detected_last_page = parse_pool.parse_listing(result_html["html"])
             pages_processed += 1
 
             if last_page_global is None:
@@ -420,29 +318,54 @@ if st.button("Start search"):
                 )
                 break
 
+            # Listing-stage relevance: no detail fetch or LLM call for unlikely offers
+            offers, skipped = filter_relevant(
+                job,
+                offers,
+                scorer=params.get("scorer", DEFAULT_SCORER),
+                threshold=params.get("threshold", DEFAULT_THRESHOLD),
+            )
+            skipped_total += len(skipped)
+
+            # Offers processed before an interruption do not count towards this page's quota
+            offers = [o for o in offers if o.get("url") not in checkpoint.seen_urls]
+
             to_take = min(len(offers), remaining)
-            batch_size = min(100, to_take)
-
-            with httpx.Client(
-                timeout=20,
-                follow_redirects=True,
-                headers=DEFAULT_HEADERS,
-            ) as client:
-                for i in range(0, to_take, batch_size):
-                    batch_offers = offers[i : i + batch_size]
-                    with progress_box.container():
-                        st.write("Processing…")
-                        bar = st.progress(0)
-                        enriched_offers = enrich_offers(
-                            client,
-                            batch_offers,
-                            max_num_of_offers,
-                            status_box,
-                            bar,
-                        )
-
-                    st.session_state.all_offers.extend(enriched_offers)
-                    time.sleep(1)
+            batch_size = max(1, min(100, to_take))
+
+            for i in range(0, to_take, batch_size):
+                batch_offers = offers[i : i + batch_size]
+                with progress_box.container():
+                    st.write("Processing…")
+                    bar = st.progress(0)
+                    enriched_offers = enrich_offers(
+                        pool,
+                        parse_pool,
+                        batch_offers,
+                        job,
+                        max_num_of_offers,
+                        checkpoint,
+                        token_budget,
+                        run_stats,
+                        archive,
+                        status_box,
+                        bar,
+                    )
+
+                st.session_state.all_offers.extend(enriched_offers)
+                ingest_offers(enriched_offers)
+                time.sleep(1)
+
+            # Offers lost to network or LLM errors: keep the page pending so resume retries them
+            if run_stats["network_failures"] or run_stats["llm_failures"]:
+                st.warning(
+                    f"{run_stats['network_failures']} offer(s) of page {page} could not be fetched "
+                    f"and {run_stats['llm_failures']} could not be sent to Gemini. Stopping."
+                )
+                completed = False
+                break
+
+            checkpoint.record_page(page, last_page_global)
 
             if page >= last_page_global:
                 st.success(
@@ -452,9 +375,188 @@ if st.button("Start search"):
 
         except Exception as e:
             st.error(f"Error while scraping page {page}: {e}")
+            completed = False
             break
     else:
         st.warning(f"Safety hard cap reached ({MAX_PAGE_HARDCAP} pages).")
 
+    if len(pool.egresses) > 1:
+        st.dataframe(pool.stats(), use_container_width=True)
+
+    if completed:
+        checkpoint.delete()
+    else:
+        checkpoint.close()
+        st.info("Progress saved. Use **Resume** below to continue from this point.")
+
     time_end = time.time()
     st.write(f"Scraping finished in {time_end - time_start:.2f} seconds.")
+    if run_stats["llm_offers"]:
+        st.caption(
+            f"LLM input trimmed by {run_stats['tokens_saved']} tokens in total "
+            f"({run_stats['tokens_saved'] / run_stats['llm_offers']:.0f} per offer on average)."
+        )
+    if run_stats["skill_tokens_dropped"]:
+        st.caption(
+            f"{run_stats['skill_tokens_dropped']} tokens of skill-bearing text did not fit the "
+            "token budget; raise it in **LLM input** if skills seem to be missing."
+        )
+    if skipped_total:
+        st.caption(f"{skipped_total} offer(s) skipped at the listing stage (low relevance).")
+
+
+st.title("Job Collection")
+
+metier = st.text_input(
+    "Job title or skill:",
+    placeholder="e.g., Data Scientist, Python, Marketing...",
+)
+pays = st.text_input(
+    "Location:",
+    placeholder="France, Germany, Spain...",
+)
+contrat_type = st.selectbox(
+    "Contract type (optional):",
+    options=[
+        "",
+        "CDI",
+        "CDD",
+        "Intérim",
+        "Stage",
+        "Alternance",
+        "Freelance",
+    ],
+)
+max_num_of_offers = st.number_input(
+    "Maximum number of job offers to fetch:",
+    step=1,
+    min_value=1,
+    max_value=1000,
+)
+
+with st.expander("LLM input"):
+    token_budget = st.number_input(
+        "Token budget per offer",
+        min_value=64,
+        max_value=4096,
+        value=DEFAULT_TOKEN_BUDGET,
+        step=64,
+        help=(
+            "Mission and profile text are cleaned (boilerplate and repeated sentences removed) "
+            "and capped at this many tokens, keeping skill-bearing sentences first."
+        ),
+    )
+
+with st.expander("Relevance filter"):
+    scorer = st.selectbox(
+        "Scorer",
+        list(SCORERS),
+        index=list(SCORERS).index(DEFAULT_SCORER),
+        help=(
+            "substring: the whole query appears in the title/company. "
+            "fuzzy: word-level similarity (tolerates typos, accents, plurals). "
+            "tfidf: character n-gram similarity to the query."
+        ),
+    )
+    threshold = st.slider(
+        "Minimum relevance score",
+        min_value=0.0,
+        max_value=1.0,
+        value=DEFAULT_THRESHOLD,
+        step=0.05,
+        help=(
+            "Offers scoring below this value on listing data (title, company) "
+            "are skipped before their page is fetched. 0 (default) disables the filter. "
+            "Raising it saves requests and LLM calls for job-title queries, but for skill "
+            "queries (e.g. Python) it drops offers whose title does not name the skill."
+        ),
+    )
+
+def model_ready() -> bool:
+    """Creates the Gemini client on first use; reports a missing key without crashing the page."""
+    try:
+        get_model()
+        return True
+    except MissingApiKey as e:
+        st.error(f"{e} Add it to the .env file and try again.")
+        return False
+
+if st.button("Start search") and model_ready():
+    params = {
+        "job": metier,
+        "location": pays,
+        "contract_type": contrat_type,
+        "max_offers": int(max_num_of_offers),
+        "scorer": scorer,
+        "threshold": threshold,
+        "token_budget": int(token_budget),
+    }
+    if any(search_key(cp.params) == search_key(params) for cp in list_checkpoints()):
+        st.warning(
+            "An interrupted collection exists for this search. It is kept: use **Resume** "
+            "below to continue it instead of starting over."
+        )
+    st.session_state.all_offers = OfferStore()
+    checkpoint = CollectionCheckpoint.create(params)
+    run_collection(checkpoint)
+
+# Interrupted runs (VPN reconnect, container restart, error)
+interrupted = list_checkpoints()
+if interrupted:
+    st.divider()
+    st.subheader("Interrupted collections")
+
+    labels = {
+        cp.path: (
+            f"{cp.params['job'] or '(any job)'} · {cp.params['location'] or '(any location)'}"
+            f"{' · ' + cp.params['contract_type'] if cp.params['contract_type'] else ''}"
+            f" — {cp.offer_count}/{cp.params['max_offers']} offers, {cp.pages_done} page(s) done"
+            f"{', started ' + cp.params['started_at'].replace('T', ' ') if cp.params.get('started_at') else ''}"
+        )
+        for cp in interrupted
+    }
+    selected_path = st.selectbox(
+        "Checkpoint",
+        list(labels),
+        format_func=labels.get,
+    )
+
+    col1, col2 = st.columns(2)
+    with col1:
+        resume = st.button("Resume")
+    with col2:
+        discard = st.button("Discard checkpoint")
+
+    if resume and model_ready():
+        try:
+            checkpoint = CollectionCheckpoint.load(selected_path)
+        except CheckpointInUse as e:
+            st.warning(str(e))
+        else:
+            if checkpoint is None:
+                st.warning("Checkpoint no longer available.")
+            else:
+                st.session_state.all_offers = OfferStore(checkpoint.offers)
+                # No-op for offers already in the rollups
+                ingest_offers(checkpoint.offers)
+                checkpoint.offers = []
+                st.write(
+                    f"Resuming from page {checkpoint.next_page} "
+                    f"with {len(st.session_state.all_offers)} offers restored."
+                )
+                run_collection(checkpoint)
+    elif discard:
+        if is_active(selected_path):
+            st.warning("This collection is running in another session.")
+        else:
+            checkpoint = CollectionCheckpoint.load(selected_path, keep_offers=False)
+            if checkpoint is not None:
+                checkpoint.delete()
+            st.rerun()
+
+with st.expander("Diagnostics"):
+    st.caption("One-time initialization cost in this process (seconds).")
+    st.dataframe(
+        [{"step": k, "seconds": round(v, 3)} for k, v in STARTUP_TIMINGS.items()],
+        use_container_width=True,
+    )
@@ -1,5 +1,7 @@
 import streamlit as st
 
+from offer_store import OfferStore
+
 st.title("Welcome to the Job Offers and Skills Analyzer")
 
 st.write(
@@ -16,6 +18,7 @@ offers = st.session_state.get("all_offers", [])
 st.subheader("Current session status")
 if offers:
     st.success(f"{len(offers)} offers collected in this session.")
+    st.caption(f"In-memory size: {offers.memory_usage() / 1024:.0f} KiB")
 else:
     st.info("No offers collected yet. Start with the Job collection page.")
 
@@ -33,7 +36,7 @@ st.write(
 col1, col2 = st.columns(2)
 with col1:
     if st.button("Reset session data"):
-        st.session_state["all_offers"] = []
+        st.session_state["all_offers"] = OfferStore()
         st.success("Session cleared.")
 
 with col2:
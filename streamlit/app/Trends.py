@@ -0,0 +1,56 @@
+import streamlit as st
+
+from rollups import DIMENSIONS, daily_counts, summary, top_values
+
+st.title("Trends")
+
+# Reads only the daily rollups filled at collection time, not the session offers
+info = summary()
+if not info["offers"]:
+    st.info("No historical data yet. Offers are added to the trends as they are collected.")
+    st.stop()
+
+st.caption(
+    f"{info['offers']} job offers collected, published between "
+    f"{info['first_day']} and {info['last_day']}."
+)
+
+days = st.select_slider(
+    "Period (days)",
+    options=[7, 14, 30, 60, 90, 180, 365],
+    value=90,
+)
+dimension = st.selectbox(
+    "Dimension",
+    list(DIMENSIONS),
+    format_func=DIMENSIONS.get,
+)
+
+values = top_values(dimension, days)
+if not values:
+    st.warning("No data for this dimension over the selected period.")
+    st.stop()
+
+value = st.selectbox("Value (most frequent first)", values)
+as_share = st.checkbox("Show as share of all job offers", value=False)
+
+df = daily_counts(dimension, value, days)
+
+if as_share:
+    series = (df["offers"] / df["all_offers"].where(df["all_offers"] > 0)).fillna(0) * 100
+    label = "% of job offers"
+else:
+    series = df["offers"]
+    label = "Job offers"
+
+st.subheader(f"{DIMENSIONS[dimension]}: {value}")
+chart = series.to_frame(label)
+chart["7-day average"] = series.rolling(7, min_periods=1).mean()
+st.line_chart(chart)
+
+col1, col2 = st.columns(2)
+col1.metric(f"Job offers ({days} days)", int(df["offers"].sum()))
+col2.metric(
+    "Share of all job offers",
+    f"{100 * df['offers'].sum() / max(1, df['all_offers'].sum()):.1f}%",
+)
@@ -1,6 +1,10 @@
+from datetime import date
+
 import streamlit as st
 import pandas as pd
-import re
+import numpy as np
+
+from facets import FACET_FIELDS, FacetIndex
 
 st.title("Access Jobs")
 
@@ -9,96 +13,72 @@ if "all_offers" not in st.session_state or not st.session_state.all_offers:
     st.info("No data available. Please run the scraping first.")
     st.stop()
 
-df = pd.DataFrame(st.session_state.all_offers).copy()
-
-# --- Helpers
-def parse_years(x):
-    if pd.isna(x):
-        return None
-    m = re.search(r"(\d+)", str(x))
-    return int(m.group(1)) if m else None
-
-def safe_to_datetime(series: pd.Series) -> pd.Series:
-    return pd.to_datetime(series, errors="coerce")
+store = st.session_state.all_offers
 
-# --- Prepare useful columns
-if "date" in df.columns:
-    df["date_dt"] = safe_to_datetime(df["date"])
-else:
-    df["date_dt"] = pd.NaT
+# Configuration constants
+DISPLAY_LIMIT = 500  # rows rendered in the HTML table (the CSV has all of them)
 
-if "years_experience_min" in df.columns:
-    df["years_num"] = df["years_experience_min"].apply(parse_years)
-else:
-    df["years_num"] = None
+FACET_TITLES = {
+    "contract_type": "Contract type",
+    "location": "Location",
+    "company": "Company",
+    "experience": "Experience (years)",
+    "date": "Published",
+}
+
+# --- Facet bitmaps, built once per dataset version and day (date buckets are relative).
+# Kept in the session, like the store they index: nothing outlives the session and
+# concurrent sessions do not evict each other's index.
+index_key = (store.version_key, date.today())
+if st.session_state.get("facet_index_key") != index_key:
+    st.session_state.facet_index = FacetIndex(store, index_key[1])
+    st.session_state.facet_index_key = index_key
+index = st.session_state.facet_index
 
 # --- Sidebar filters
 st.sidebar.header("Filters")
 
-df_f = df.copy()
-
 # 1) Text search (title / company / location)
 q = st.sidebar.text_input("Search (job title, company, location)", value="").strip()
-if q:
-    cols = [c for c in ["title", "company", "location"] if c in df_f.columns]
-    if cols:
-        mask = False
-        for c in cols:
-            mask = mask | df_f[c].fillna("").str.contains(q, case=False, regex=False)
-        df_f = df_f[mask]
-
-# 2) Contract type
-if "contract_type" in df_f.columns:
-    opts = sorted([x for x in df_f["contract_type"].dropna().unique()])
-    if opts:
-        selected = st.sidebar.multiselect("Contract type", opts, default=opts)
-        df_f = df_f[df_f["contract_type"].isin(selected)] if selected else df_f.iloc[0:0]
-
-# 3) Location
-if "location" in df_f.columns:
-    locs = sorted([x for x in df_f["location"].dropna().unique()])
-    if locs:
-        selected_locs = st.sidebar.multiselect("Location", locs, default=[])
-        if selected_locs:
-            df_f = df_f[df_f["location"].isin(selected_locs)]
-
-# 4) Company
-if "company" in df_f.columns:
-    companies = sorted([x for x in df_f["company"].dropna().unique()])
-    if companies:
-        selected_companies = st.sidebar.multiselect("Company", companies, default=[])
-        if selected_companies:
-            df_f = df_f[df_f["company"].isin(selected_companies)]
-
-# 5) Date range
-if df_f["date_dt"].notna().any():
-    dmin = df_f["date_dt"].min().date()
-    dmax = df_f["date_dt"].max().date()
-    d1, d2 = st.sidebar.date_input("Date range", value=(dmin, dmax))
-    df_f = df_f[
-        df_f["date_dt"].between(
-            pd.to_datetime(d1),
-            pd.to_datetime(d2),
-            inclusive="both"
-        )
-    ]
-
-# 6) Experience (years)
-if df_f["years_num"].notna().any():
-    mn = int(df_f["years_num"].min())
-    mx = int(df_f["years_num"].max())
-    if mn == mx:
-        st.sidebar.caption(f"Experience: {mn} year(s) (single value)")
-    else:
-        r = st.sidebar.slider("Experience (years)", mn, mx, (mn, mx), step=1)
-        df_f = df_f[df_f["years_num"].between(r[0], r[1])]
+base = index.search(q) if q else None
+
+# 2) Facets: current selections come from the widget state, so live counts can be
+# computed before the widgets are drawn. An empty selection does not filter.
+selections = {}
+for name in FACET_FIELDS:
+    key = f"facet_{name}"
+    known = set(index.facets[name].labels)
+    # Values of a previous (reset) dataset are dropped
+    selections[name] = [v for v in st.session_state.get(key, []) if v in known]
+    if key in st.session_state:
+        st.session_state[key] = selections[name]
+
+counts = index.counts(selections, base)
+for name in FACET_FIELDS:
+    facet = index.facets[name]
+    if not facet.labels:
+        continue
+    count_of = dict(zip(facet.labels, counts[name].tolist()))
+    # Bucket facets keep their natural order
+    options = facet.labels if name in ("experience", "date") else sorted(facet.labels)
+    st.sidebar.multiselect(
+        FACET_TITLES[name],
+        options,
+        key=f"facet_{name}",
+        format_func=lambda v, count_of=count_of: f"{v} ({count_of[v]})",
+    )
+
+mask = index.filter(selections, base)
+rows = np.flatnonzero(mask)
+# Only the displayed rows are decoded; the CSV decodes the rest on click
+df_f = store.to_dataframe(rows[:DISPLAY_LIMIT])
 
 # --- Results
 st.subheader("Results")
 
 col1, col2 = st.columns(2)
-col1.metric("Filtered job offers", len(df_f))
-col2.metric("Total job offers", len(df))
+col1.metric("Filtered job offers", len(rows))
+col2.metric("Total job offers", len(store))
 
 display_cols = [
     "title",
@@ -113,6 +93,9 @@ display_cols = [
 display_cols = [c for c in display_cols if c in df_f.columns]
 df_display = df_f[display_cols].copy()
 
+if "date" in df_display.columns:
+    df_display["date"] = df_display["date"].dt.date
+
 # Rename columns for UI
 df_display = df_display.rename(columns={
     "title": "Job title",
@@ -145,10 +128,13 @@ def render_html_table(df):
     st.markdown(html, unsafe_allow_html=True)
 
 render_html_table(df_display)
+if len(rows) > DISPLAY_LIMIT:
+    st.caption(f"Showing the first {DISPLAY_LIMIT} of {len(rows)} offers; the CSV contains all of them.")
 
 st.download_button(
     "Download results (CSV)",
-    df_f.to_csv(index=False).encode("utf-8"),
+    # Generated on click, not on every filter change
+    lambda: store.to_dataframe(rows).to_csv(index=False).encode("utf-8"),
     file_name="job_offers_filtered.csv",
     mime="text/csv",
 )
@@ -1,13 +1,16 @@
 import streamlit as st
 
+from offer_store import OfferStore
+
 if "all_offers" not in st.session_state:
-    st.session_state.all_offers = []
+    st.session_state.all_offers = OfferStore()
 
 pg = st.navigation(
     [
         "Overview.py",
         "Job_collection.py",
         "Analysis.py",
+        "Trends.py",
         "Access_jobs.py",
     ]
 )
@@ -0,0 +1,215 @@
+import hashlib
+import json
+import os
+import uuid
+from datetime import date, datetime
+from typing import Dict, List, Optional, Set
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-session locking
+    fcntl = None
+
+# Configuration constants
+DATA_DIR = os.getenv("APP_DATA_DIR", "data")
+CHECKPOINT_DIR = os.path.join(DATA_DIR, "checkpoints")
+FSYNC_EVERY = 10  # offers between two fsync calls
+
+
+def _json_default(value):
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"Not JSON serializable: {type(value).__name__}")
+
+
+class CheckpointInUse(RuntimeError):
+    pass
+
+
+def _lock(file) -> bool:
+    """
+    Exclusive, non-blocking lock on an open journal, held until the file is closed.
+    False if another run (any session of any process) holds it.
+    """
+    if fcntl is None:
+        return True
+    try:
+        fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return True
+    except BlockingIOError:
+        return False
+
+
+def is_active(path: str) -> bool:
+    """True while a run is writing to this journal."""
+    try:
+        with open(path, "rb") as f:
+            return not _lock(f)
+    except FileNotFoundError:
+        return False
+
+
+def search_key(params: Dict) -> str:
+    """Identifies a search (job, location, contract type) across runs."""
+    key = json.dumps([params.get("job"), params.get("location"), params.get("contract_type")])
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+
+def checkpoint_path(params: Dict) -> str:
+    """
+    One journal file per run: starting the same search again never overwrites
+    an interrupted run that could still be resumed.
+    """
+    return os.path.join(CHECKPOINT_DIR, f"{search_key(params)}-{uuid.uuid4().hex[:8]}.jsonl")
+
+
+class CollectionCheckpoint:
+    """
+    Append-only JSONL journal of a collection run.
+
+    Records:
+    - {"type": "params", ...}: search parameters (first line)
+    - {"type": "offer", "url": ..., "offer": {...} | null}: an offer was processed
+      (null when it was fetched but discarded, so it is not fetched again)
+    - {"type": "page", "page": n, "last_page": m}: listing page n fully processed
+
+    Every record is flushed immediately and fsync'ed periodically, so a crash
+    or a container restart loses at most a few offers.
+    """
+
+    def __init__(self, path: str, params: Dict):
+        self.path = path
+        self.params = params
+        self.pages_done = 0
+        self.last_page: Optional[int] = None
+        self.seen_urls: Set[str] = set()
+        self.offers: List[Dict] = []  # filled by load() only; new offers live in the journal
+        self.offer_count = 0
+        self._file = None
+        self._unsynced = 0
+
+    @classmethod
+    def create(cls, params: Dict) -> "CollectionCheckpoint":
+        """Starts a new journal (its own file; other runs of the same search are kept)."""
+        params = {**params, "started_at": datetime.now().isoformat(timespec="seconds")}
+        path = checkpoint_path(params)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        checkpoint = cls(path, params)
+        checkpoint._file = open(path, "x", encoding="utf-8")
+        _lock(checkpoint._file)
+        checkpoint._write({"type": "params", **params}, sync=True)
+        return checkpoint
+
+    @classmethod
+    def load(cls, path: str, keep_offers: bool = True) -> Optional["CollectionCheckpoint"]:
+        """
+        Replays a journal. A truncated last line (crash during a write) is ignored.
+        With keep_offers=False only counts are kept (listing checkpoints in the UI).
+        With keep_offers=True the journal is locked for appending; raises
+        CheckpointInUse if another run holds it.
+        Returns None if the file is missing or has no params record.
+        """
+        if not os.path.exists(path):
+            return None
+
+        journal = None
+        if keep_offers:
+            journal = open(path, "a", encoding="utf-8")
+            if not _lock(journal):
+                journal.close()
+                raise CheckpointInUse("This collection is running in another session.")
+
+        checkpoint = None
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+                kind = record.pop("type", None)
+                if kind == "params":
+                    checkpoint = cls(path, record)
+                elif checkpoint is None:
+                    continue
+                elif kind == "offer":
+                    checkpoint.seen_urls.add(record["url"])
+                    if record.get("offer"):
+                        checkpoint.offer_count += 1
+                        if keep_offers:
+                            checkpoint.offers.append(record["offer"])
+                elif kind == "page":
+                    checkpoint.pages_done = max(checkpoint.pages_done, record["page"])
+                    checkpoint.last_page = record.get("last_page")
+
+        if journal is not None and checkpoint is None:
+            journal.close()
+        elif journal is not None:
+            with open(path, "rb") as f:
+                f.seek(0, os.SEEK_END)
+                truncated = f.tell() > 0 and f.seek(-1, os.SEEK_END) >= 0 and f.read(1) != b"\n"
+            checkpoint._file = journal
+            # Terminate a truncated last line so the next record stays parseable
+            if truncated:
+                checkpoint._file.write("\n")
+        return checkpoint
+
+    @property
+    def next_page(self) -> int:
+        return self.pages_done + 1
+
+    def _write(self, record: Dict, sync: bool = False) -> None:
+        self._file.write(json.dumps(record, default=_json_default, ensure_ascii=False) + "\n")
+        self._file.flush()
+        self._unsynced += 1
+        if sync or self._unsynced >= FSYNC_EVERY:
+            os.fsync(self._file.fileno())
+            self._unsynced = 0
+
+    def record_offer(self, url: str, offer: Optional[Dict]) -> None:
+        self.seen_urls.add(url)
+        if offer:
+            self.offer_count += 1
+        self._write({"type": "offer", "url": url, "offer": offer})
+
+    def record_page(self, page: int, last_page: Optional[int]) -> None:
+        self.pages_done = max(self.pages_done, page)
+        self.last_page = last_page
+        self._write({"type": "page", "page": page, "last_page": last_page}, sync=True)
+
+    def close(self) -> None:
+        if self._file and not self._file.closed:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+
+    def delete(self) -> None:
+        """Called when a run completes: nothing left to resume."""
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def list_checkpoints() -> List[CollectionCheckpoint]:
+    """
+    Interrupted runs found on disk (summaries only), most recent first.
+    Journals locked by a run still in progress (another session or tab) are skipped.
+    """
+    if not os.path.isdir(CHECKPOINT_DIR):
+        return []
+
+    paths = [
+        os.path.join(CHECKPOINT_DIR, name)
+        for name in os.listdir(CHECKPOINT_DIR)
+        if name.endswith(".jsonl")
+    ]
+    paths.sort(key=os.path.getmtime, reverse=True)
+
+    checkpoints = []
+    for path in paths:
+        if is_active(path):
+            continue
+        checkpoint = CollectionCheckpoint.load(path, keep_offers=False)
+        if checkpoint is not None:
+            checkpoints.append(checkpoint)
+    return checkpoints
@@ -0,0 +1,135 @@
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.cluster.hierarchy import leaves_list, linkage
+from scipy.spatial.distance import squareform
+
+from normalize import clean_skill
+from offer_store import OfferStore, as_numpy
+
+
+@dataclass
+class Cooccurrence:
+    """
+    Skill co-occurrence statistics for one skill field.
+
+    - labels: cleaned skill names (column order of the matrices)
+    - counts: number of offers mentioning each skill
+    - pairs: symmetric sparse matrix of offers mentioning both skills (X^T X)
+    - n_offers: offers with at least one skill
+    """
+
+    labels: np.ndarray
+    counts: np.ndarray
+    pairs: sparse.csr_matrix
+    n_offers: int
+
+
+def skill_matrix(store: OfferStore, field: str):
+    """
+    Binary offer x skill CSR matrix built straight from the store's offsets/ids.
+    Skills equal after `clean_skill` share one column. Returns (matrix, labels).
+    """
+    indptr = as_numpy(store.offsets[field])
+    indices = as_numpy(store.skill_ids[field])
+
+    # Cleaning is done once per vocabulary entry, not once per mention
+    cleaned = np.array([clean_skill(v) for v in store.skills.values], dtype=object)
+    if not len(cleaned):
+        return sparse.csr_matrix((len(store), 0), dtype=np.float32), np.array([], dtype=object)
+    labels, column_of = np.unique(cleaned, return_inverse=True)
+
+    X = sparse.csr_matrix(
+        (np.ones(len(indices), dtype=np.float32), column_of[indices], indptr),
+        shape=(len(store), len(labels)),
+    )
+    X.sum_duplicates()
+    X.data[:] = 1.0
+
+    # Drop skills unused in this field (the vocabulary is shared) and empty labels
+    used = (np.asarray(X.sum(axis=0)).ravel() > 0) & (labels != "")
+    return X[:, used].tocsr(), labels[used]
+
+
+def skill_counts(X: sparse.csr_matrix, labels: np.ndarray, rows: Optional[np.ndarray] = None) -> pd.Series:
+    """Number of offers mentioning each skill (optionally among a boolean row mask), most frequent first."""
+    if rows is not None:
+        X = X[rows]
+    counts = pd.Series(np.asarray(X.sum(axis=0)).ravel().astype(int), index=labels, name="count")
+    return counts[counts > 0].sort_values(ascending=False, kind="stable")
+
+
+def compute_cooccurrence(store: OfferStore, field: str) -> Cooccurrence:
+    X, labels = skill_matrix(store, field)
+    pairs = (X.T @ X).tocsr()
+    counts = pairs.diagonal()
+    n_offers = int(np.count_nonzero(np.diff(X.indptr)))
+    return Cooccurrence(labels=labels, counts=counts, pairs=pairs, n_offers=n_offers)
+
+
+def association_scores(co: Cooccurrence, together: np.ndarray, a: np.ndarray, b: np.ndarray):
+    """Vectorized lift and PMI (log2) for co-occurrence counts of skill pairs (a, b)."""
+    lift = together * co.n_offers / (co.counts[a] * co.counts[b])
+    with np.errstate(divide="ignore"):
+        pmi = np.log2(lift)
+    return lift, pmi
+
+
+def related_skills(co: Cooccurrence, skill: str, min_together: int = 2, top: int = 20) -> pd.DataFrame:
+    """
+    Skills most associated with `skill`, ranked by lift.
+    Only pairs seen together in at least `min_together` offers are kept.
+    """
+    idx = int(np.searchsorted(co.labels, skill))
+    if idx >= len(co.labels) or co.labels[idx] != skill:
+        return pd.DataFrame()
+
+    row = co.pairs.getrow(idx)
+    others = row.indices
+    together = row.data
+    keep = (others != idx) & (together >= min_together)
+    others, together = others[keep], together[keep]
+
+    lift, pmi = association_scores(co, together, np.full(len(others), idx), others)
+    result = pd.DataFrame(
+        {
+            "Skill": co.labels[others],
+            "Together": together.astype(int),
+            "Confidence": together / co.counts[idx],
+            "Lift": lift,
+            "PMI": pmi,
+        }
+    )
+    return result.sort_values(["Lift", "Together"], ascending=False).head(top).reset_index(drop=True)
+
+
+def clustered_matrix(co: Cooccurrence, top_k: int = 30, metric: str = "PMI") -> pd.DataFrame:
+    """
+    Dense lift/PMI matrix of the `top_k` most frequent skills, rows and columns
+    reordered by average-linkage clustering on their co-occurrence profiles.
+    Pairs never seen together get 0 (PMI) or 1 (lift), i.e. "no association".
+    """
+    top = np.argsort(-co.counts, kind="stable")[:top_k]
+    sub = co.pairs[top][:, top].toarray()
+
+    a, b = np.meshgrid(top, top, indexing="ij")
+    lift, pmi = association_scores(co, sub, a, b)
+    scores = pmi if metric == "PMI" else lift
+    scores = np.where(sub > 0, scores, 0.0 if metric == "PMI" else 1.0)
+    np.fill_diagonal(scores, np.nan)
+
+    labels: List[str] = list(co.labels[top])
+    if len(top) > 2:
+        # Cosine distance between co-occurrence profiles
+        norms = np.linalg.norm(sub, axis=1, keepdims=True)
+        profiles = sub / np.where(norms == 0, 1, norms)
+        distance = np.clip(1 - profiles @ profiles.T, 0, None)
+        np.fill_diagonal(distance, 0)
+        order = leaves_list(linkage(squareform(distance, checks=False), method="average"))
+        scores = scores[np.ix_(order, order)]
+        labels = [labels[i] for i in order]
+
+    return pd.DataFrame(scores, index=labels, columns=labels)
@@ -0,0 +1,85 @@
+import json
+from typing import Callable, Dict, Optional
+
+# Configuration constants
+MAX_ATTEMPTS = 5
+REQUIRED_KEYS = ("hard_skills", "soft_skills", "years_experience_min", "domains")
+
+
+def empty_result() -> Dict:
+    return {
+        "hard_skills": [],
+        "soft_skills": [],
+        "years_experience_min": None,
+        "domains": [],
+    }
+
+
+def prompt_gemini(job_offer: str) -> str:
+    return f"""
+    You are an information extractor for job offers.
+    Reply ONLY with valid JSON. No markdown. No extra text.
+
+    Constraints:
+    - Do not invent anything.
+    - If missing: null or [].
+    - Deduplicate, trim, normalize (same casing).
+    - Follow EXACTLY the keys below.
+
+    Expected JSON:
+    {{
+    "hard_skills": [],
+    "soft_skills": [],
+    "years_experience_min": null,
+    "domains": []
+    }}
+
+    Text:
+    \"\"\"{job_offer}\"\"\"
+    """.strip()
+
+
+def llm_extract(
+    model,
+    job_offer: str,
+    experience_years: Optional[str],
+    url: str,
+    warn: Callable[[str], None] = print,
+) -> Optional[Dict]:
+    """
+    Sends the offer text to Gemini and validates the JSON answer.
+    Returns None after MAX_ATTEMPTS invalid answers. API errors (quota, network)
+    are raised: the offer was not processed and should be retried.
+    """
+    for attempt in range(MAX_ATTEMPTS):
+        prompt = prompt_gemini(job_offer)
+
+        # Gemini call
+        result = model.generate_content(
+            prompt,
+            generation_config={"response_mime_type": "application/json"},
+        )
+
+        # Parse JSON response
+        try:
+            data = json.loads(result.text)
+            if any(key not in data for key in REQUIRED_KEYS):
+                warn(
+                    f"Missing fields in response for offer {url}. Attempt {attempt+1}/{MAX_ATTEMPTS}."
+                )
+                continue
+
+            data["hard_skills"] = sorted(data["hard_skills"], key=str.lower)
+            data["soft_skills"] = sorted(data["soft_skills"], key=str.lower)
+            data["years_experience_min"] = (
+                int(data["years_experience_min"])
+                if data["years_experience_min"] is not None
+                else experience_years
+            )
+            return data
+        except (json.JSONDecodeError, TypeError, ValueError, AttributeError):
+            # Invalid JSON or values (null skill list, "3-5" years): ask again
+            continue
+
+    warn(f"Extraction failed after {MAX_ATTEMPTS} attempts for offer {url}.")
+    return None
@@ -0,0 +1,159 @@
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from normalize import EXPERIENCE_BINS, EXPERIENCE_LABELS
+from offer_store import MISSING, OfferStore, as_numpy
+
+# Configuration constants
+# Facets with more values keep postings lists instead of one dense bitmap per value
+DENSE_MAX_VALUES = 64
+
+# Age of the offer in days; upper bounds of each bucket (last bucket is open)
+DATE_BUCKET_BOUNDS = [1, 7, 30]
+DATE_BUCKET_LABELS = ["0-1 days", "2-7 days", "8-30 days", "31+ days"]
+
+FACET_FIELDS = ("contract_type", "location", "company", "experience", "date")
+
+
+@dataclass
+class Facet:
+    """
+    One filterable field: a value code per offer (MISSING when absent) and, per value,
+    the set of offers having it.
+
+    Low-cardinality facets keep one NumPy boolean bitmap per value; the others keep
+    postings lists (offer positions grouped by value, CSR layout) that are turned into
+    a bitmap only for the selected values.
+    """
+
+    labels: List[str]
+    codes: np.ndarray
+    bitmaps: Optional[np.ndarray] = None
+    postings: Optional[np.ndarray] = None
+    offsets: Optional[np.ndarray] = None
+
+    @classmethod
+    def build(cls, labels: Sequence[str], codes: np.ndarray) -> "Facet":
+        labels = list(labels)
+        codes = codes.astype(np.int32, copy=False)
+        if len(labels) <= DENSE_MAX_VALUES:
+            bitmaps = codes[None, :] == np.arange(len(labels), dtype=np.int32)[:, None]
+            return cls(labels, codes, bitmaps=bitmaps)
+
+        present = np.flatnonzero(codes != MISSING)
+        postings = present[np.argsort(codes[present], kind="stable")].astype(np.int32)
+        offsets = np.zeros(len(labels) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(codes[present], minlength=len(labels)), out=offsets[1:])
+        return cls(labels, codes, postings=postings, offsets=offsets)
+
+    def bitmap(self, value_ids: Sequence[int]) -> np.ndarray:
+        """Offers having any of the given values (OR of the value bitmaps)."""
+        if self.bitmaps is not None:
+            return self.bitmaps[list(value_ids)].any(axis=0)
+        mask = np.zeros(len(self.codes), dtype=bool)
+        for v in value_ids:
+            mask[self.postings[self.offsets[v] : self.offsets[v + 1]]] = True
+        return mask
+
+    def counts(self, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """Number of offers per value among the masked offers."""
+        codes = self.codes if mask is None else self.codes[mask]
+        return np.bincount(codes + 1, minlength=len(self.labels) + 1)[1:]
+
+
+def experience_codes(years: np.ndarray) -> np.ndarray:
+    """Bucket index per offer (same ranges as normalize.experience_bucket), MISSING otherwise."""
+    codes = np.searchsorted(EXPERIENCE_BINS[1:], years, side="left")
+    return np.where((years < 0) | (codes >= len(EXPERIENCE_LABELS)), MISSING, codes)
+
+
+def date_codes(ordinals: np.ndarray, today: date) -> np.ndarray:
+    """Age bucket index per offer, MISSING when the date is unknown."""
+    age = today.toordinal() - ordinals
+    codes = np.searchsorted(DATE_BUCKET_BOUNDS, age, side="left")
+    return np.where(ordinals == MISSING, MISSING, codes)
+
+
+class FacetIndex:
+    """
+    Bitmap indexes over an OfferStore, built once per dataset version (and day,
+    for the date buckets). Filtering is an intersection of bitmaps; live counts
+    are a bincount of the value codes under the current mask.
+
+    A selection maps a facet name to a list of labels; an empty list does not filter.
+    """
+
+    def __init__(self, store: OfferStore, today: Optional[date] = None):
+        today = today or date.today()
+        self.size = len(store)
+
+        facets = {}
+        for f in ("contract_type", "location", "company"):
+            facets[f] = Facet.build(store.vocabularies[f].values, as_numpy(store.codes[f]))
+        facets["experience"] = Facet.build(EXPERIENCE_LABELS, experience_codes(as_numpy(store.years)))
+        facets["date"] = Facet.build(DATE_BUCKET_LABELS, date_codes(as_numpy(store.dates), today))
+        self.facets: Dict[str, Facet] = facets
+
+        # Distinct values and codes for text search (no reference to the store itself)
+        self._text = {
+            "title": (list(store.vocabularies["title"].values), as_numpy(store.codes["title"])),
+            "company": (facets["company"].labels, facets["company"].codes),
+            "location": (facets["location"].labels, facets["location"].codes),
+        }
+
+        # Value id per label, for turning widget selections into bitmap lookups
+        self._ids = {name: {label: i for i, label in enumerate(f.labels)} for name, f in facets.items()}
+
+    def search(self, query: str, fields: Sequence[str] = ("title", "company", "location")) -> np.ndarray:
+        """
+        Case-insensitive substring search. Matching is done once per distinct value
+        (vocabulary entry), then mapped to offers through the codes.
+        """
+        query = query.lower()
+        mask = np.zeros(self.size, dtype=bool)
+        for f in fields:
+            values, codes = self._text[f]
+            matching = [i for i, v in enumerate(values) if query in v.lower()]
+            if matching:
+                mask |= np.isin(codes, matching)
+        return mask
+
+    def facet_mask(self, name: str, labels: Sequence[str]) -> Optional[np.ndarray]:
+        """Offers matching the selected labels of one facet, None when nothing is selected."""
+        ids = [self._ids[name][label] for label in labels if label in self._ids[name]]
+        if not labels:
+            return None
+        return self.facets[name].bitmap(ids)
+
+    def filter(
+        self,
+        selections: Dict[str, Sequence[str]],
+        base: Optional[np.ndarray] = None,
+        exclude: Optional[str] = None,
+    ) -> np.ndarray:
+        """AND of `base` and every facet selection (except `exclude`)."""
+        mask = np.ones(self.size, dtype=bool) if base is None else base.copy()
+        for name, labels in selections.items():
+            if name == exclude:
+                continue
+            facet_mask = self.facet_mask(name, labels)
+            if facet_mask is not None:
+                mask &= facet_mask
+        return mask
+
+    def counts(
+        self,
+        selections: Dict[str, Sequence[str]],
+        base: Optional[np.ndarray] = None,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Live counts per facet value. Each facet is counted under the other facets'
+        selections, so selecting a value does not hide its alternatives.
+        """
+        return {
+            name: facet.counts(self.filter(selections, base, exclude=name))
+            for name, facet in self.facets.items()
+        }
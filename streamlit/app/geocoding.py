@@ -0,0 +1,219 @@
+import csv
+import json
+import os
+import tempfile
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Configuration constants
+DATA_DIR = os.getenv("APP_DATA_DIR", "data")
+GEOCODE_CACHE_PATH = os.path.join(DATA_DIR, "geocode_cache.json")
+COMMUNES_CSV_PATH = os.getenv("COMMUNES_CSV_PATH", os.path.join(DATA_DIR, "communes.csv"))
+GEOCODER_USER_AGENT = "job-offers-analyzer"
+GEOCODER_MIN_DELAY_SECONDS = 1.0
+MAX_NETWORK_LOOKUPS = 50
+
+Coordinates = Tuple[float, float]
+
+# Column names accepted for the communes CSV (data.gouv.fr exports vary)
+NAME_COLUMNS = ["nom_commune", "nom_commune_complet", "nom_standard", "nom", "name"]
+LAT_COLUMNS = ["latitude", "latitude_centre", "lat"]
+LON_COLUMNS = ["longitude", "longitude_centre", "lon", "lng"]
+POPULATION_COLUMNS = ["population", "population_totale"]
+
+
+def normalize_place(name: str) -> str:
+    """
+    Normalizes a place name for lookups: lower case, no accents,
+    hyphens/apostrophes as spaces, 'saint' abbreviations expanded.
+    """
+    s = unicodedata.normalize("NFKD", str(name))
+    s = "".join(c for c in s if not unicodedata.combining(c))
+    s = s.lower().replace("-", " ").replace("'", " ").replace("’", " ")
+    words = s.split()
+    words = ["saint" if w == "st" else "sainte" if w == "ste" else w for w in words]
+    return " ".join(words)
+
+
+def _pick_column(fieldnames: List[str], candidates: List[str]) -> Optional[str]:
+    lowered = {f.lower(): f for f in fieldnames}
+    for c in candidates:
+        if c in lowered:
+            return lowered[c]
+    return None
+
+
+def _to_float(value: Optional[str]) -> Optional[float]:
+    try:
+        return float(str(value).replace(",", "."))
+    except (TypeError, ValueError):
+        return None
+
+
+def load_gazetteer(path: str = COMMUNES_CSV_PATH) -> Dict[str, Coordinates]:
+    """
+    Loads the offline French communes CSV as {normalized name: (lat, lon)}.
+    When several communes share a name, the most populated one wins.
+    Returns {} if the file is missing or has no usable columns.
+    """
+    if not os.path.exists(path):
+        return {}
+
+    gazetteer: Dict[str, Coordinates] = {}
+    best_population: Dict[str, float] = {}
+
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        sample = f.read(4096)
+        f.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
+        except csv.Error:
+            dialect = csv.excel
+        reader = csv.DictReader(f, dialect=dialect)
+        fieldnames = reader.fieldnames or []
+
+        name_col = _pick_column(fieldnames, NAME_COLUMNS)
+        lat_col = _pick_column(fieldnames, LAT_COLUMNS)
+        lon_col = _pick_column(fieldnames, LON_COLUMNS)
+        pop_col = _pick_column(fieldnames, POPULATION_COLUMNS)
+        if not (name_col and lat_col and lon_col):
+            return {}
+
+        for row in reader:
+            lat = _to_float(row.get(lat_col))
+            lon = _to_float(row.get(lon_col))
+            if lat is None or lon is None or not row.get(name_col):
+                continue
+
+            key = normalize_place(row[name_col])
+            population = _to_float(row.get(pop_col)) if pop_col else None
+            population = population or 0.0
+            if key not in gazetteer or population > best_population[key]:
+                gazetteer[key] = (lat, lon)
+                best_population[key] = population
+
+    return gazetteer
+
+
+class GeocodeCache:
+    """
+    Persistent location -> coordinates cache stored as JSON.
+    Places the geocoder answered "not found" are cached as None so it is never
+    asked twice; failed lookups (timeout, rate limit) are not cached.
+    """
+
+    def __init__(self, path: str = GEOCODE_CACHE_PATH):
+        self.path = path
+        self.entries: Dict[str, Optional[Coordinates]] = {}
+        self.dirty = False
+        if os.path.exists(path):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    raw = json.load(f)
+                self.entries = {k: tuple(v) if v else None for k, v in raw.items()}
+            except (OSError, ValueError):
+                self.entries = {}
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.entries
+
+    def get(self, key: str) -> Optional[Coordinates]:
+        return self.entries.get(key)
+
+    def set(self, key: str, coords: Optional[Coordinates]) -> None:
+        self.entries[key] = coords
+        self.dirty = True
+
+    def save(self) -> None:
+        """Atomic write (temp file + rename) so a crash never corrupts the cache."""
+        if not self.dirty:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        # Unique temp file: concurrent sessions never write to the same one
+        with tempfile.NamedTemporaryFile(
+            "w",
+            encoding="utf-8",
+            dir=os.path.dirname(self.path) or ".",
+            prefix=f"{os.path.basename(self.path)}.",
+            suffix=".tmp",
+            delete=False,
+        ) as f:
+            tmp_path = f.name
+            try:
+                json.dump({k: list(v) if v else None for k, v in self.entries.items()}, f)
+            except BaseException:
+                f.close()
+                os.remove(tmp_path)
+                raise
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+
+def build_network_geocoder():
+    """
+    Returns a rate-limited Nominatim geocode function, or None if geopy is unavailable.
+    Errors (timeout, rate limit, service down) are raised, not turned into a "not found".
+    """
+    try:
+        from geopy.extra.rate_limiter import RateLimiter
+        from geopy.geocoders import Nominatim
+    except ImportError:
+        return None
+
+    geolocator = Nominatim(user_agent=GEOCODER_USER_AGENT, timeout=10)
+    return RateLimiter(
+        geolocator.geocode,
+        min_delay_seconds=GEOCODER_MIN_DELAY_SECONDS,
+        max_retries=1,
+        swallow_exceptions=False,
+    )
+
+
+def geocode_cities(
+    cities: Iterable[str],
+    gazetteer: Dict[str, Coordinates],
+    cache: GeocodeCache,
+    geocoder=None,
+    max_network_lookups: int = MAX_NETWORK_LOOKUPS,
+    country: str = "France",
+) -> Dict[str, Optional[Coordinates]]:
+    """
+    Batch resolution of distinct city names to (lat, lon).
+    Lookup order: gazetteer -> persistent cache -> network geocoder (bounded).
+    Cities left unresolved because the network budget ran out or the lookup failed
+    are returned as None but are not cached, so a later run can still resolve them.
+    The first failed lookup stops network lookups for the rest of the batch
+    (a timeout or rate limit would hit the next ones as well).
+    """
+    resolved: Dict[str, Optional[Coordinates]] = {}
+    network_calls = 0
+    network_failed = False
+
+    for city in dict.fromkeys(c for c in cities if c):
+        key = normalize_place(city)
+
+        if key in gazetteer:
+            resolved[city] = gazetteer[key]
+            continue
+
+        if key in cache:
+            resolved[city] = cache.get(key)
+            continue
+
+        if geocoder is None or network_failed or network_calls >= max_network_lookups:
+            resolved[city] = None
+            continue
+
+        network_calls += 1
+        try:
+            location = geocoder(f"{city}, {country}")
+        except Exception:
+            network_failed = True
+            resolved[city] = None
+            continue
+        coords = (location.latitude, location.longitude) if location else None
+        cache.set(key, coords)
+        resolved[city] = coords
+
+    cache.save()
+    return resolved
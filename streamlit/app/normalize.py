@@ -0,0 +1,53 @@
+import re
+import unicodedata
+from typing import Optional
+
+# Experience ranges (upper bounds included), shared by the analysis and rollup tables
+EXPERIENCE_BINS = [0, 2, 4, 6, 9, 50]
+EXPERIENCE_LABELS = ["0-2", "3-4", "5-6", "7-9", "10+"]
+
+
+def clean_skill(s: str) -> str:
+    """Light cleaning: trim + lower + collapse spaces"""
+    s = str(s).strip().lower()
+    s = re.sub(r"\s+", " ", s)
+    return s
+
+
+def extract_city(loc: str) -> Optional[str]:
+    """City name from a HelloWork location ('Paris - 75' -> 'Paris'), None if unusable"""
+    if not isinstance(loc, str) or not loc.strip():
+        return None
+
+    loc = loc.strip()
+
+    # HelloWork real separator: " - "
+    if " - " in loc:
+        loc = loc.split(" - ")[0].strip()
+
+    # Remove district numbers / suffixes
+    loc = re.sub(r"\s+\d+(e|er)?$", "", loc, flags=re.IGNORECASE)
+
+    # Final cleanup: letters, accents, spaces, apostrophes, hyphens
+    m = re.match(r"^[A-Za-zÀ-ÿ'\-\s]+$", loc)
+    if not m:
+        return None
+
+    return loc.strip() if loc.strip() else None
+
+
+def experience_bucket(years: Optional[int]) -> Optional[str]:
+    """Experience range label for a number of years (same ranges as pd.cut on EXPERIENCE_BINS)"""
+    if years is None or years < 0:
+        return None
+    for upper, label in zip(EXPERIENCE_BINS[1:], EXPERIENCE_LABELS):
+        if years <= upper:
+            return label
+    return None
+
+
+def fold_text(s: str) -> str:
+    """Lower case without accents, for matching user queries against listing text"""
+    s = unicodedata.normalize("NFKD", str(s))
+    s = "".join(c for c in s if not unicodedata.combining(c))
+    return re.sub(r"\s+", " ", s.lower()).strip()
@@ -0,0 +1,203 @@
+import re
+import sys
+import uuid
+from array import array
+from datetime import date
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Day 0 of the datetime64 epoch, as a proleptic Gregorian ordinal
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+MISSING = -1
+
+
+def as_numpy(values: array) -> np.ndarray:
+    """
+    NumPy copy of an array.array. A live buffer view would block further appends
+    (array.array cannot resize while exporting its buffer), and the copy costs only
+    a few bytes per offer.
+    """
+    return np.frombuffer(values, dtype=np.dtype(values.typecode)).copy()
+
+
+class Vocabulary:
+    """
+    Dictionary encoding: each distinct string is stored once and referenced by an int id.
+    """
+
+    __slots__ = ("ids", "values")
+
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.values: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def encode(self, value: Optional[str]) -> int:
+        if value is None:
+            return MISSING
+        value = str(value)
+        code = self.ids.get(value)
+        if code is None:
+            code = len(self.values)
+            value = sys.intern(value)
+            self.ids[value] = code
+            self.values.append(value)
+        return code
+
+    def decode(self, code: int) -> Optional[str]:
+        return self.values[code] if code != MISSING else None
+
+
+def parse_years(value) -> int:
+    """Years of experience as int, MISSING if absent ('3', 3, '3 ans' -> 3)."""
+    if value is None:
+        return MISSING
+    if isinstance(value, int):
+        return value
+    m = re.search(r"\d+", str(value))
+    return int(m.group(0)) if m else MISSING
+
+
+class OfferStore:
+    """
+    Columnar, dictionary-encoded storage for collected offers.
+
+    - title / contract_type / location / company: int codes into per-field vocabularies
+    - hard_skills / soft_skills / domains: CSR layout (offsets + ids) into one shared vocabulary
+    - date: proleptic ordinal, years_experience_min: int, MISSING (-1) when absent
+    - url: plain strings (unique per offer)
+
+    Analysis pages read it through `to_dataframe()`.
+    """
+
+    CATEGORICAL_FIELDS = ("title", "contract_type", "location", "company")
+    LIST_FIELDS = ("hard_skills", "soft_skills", "domains")
+
+    def __init__(self, offers: Optional[Iterable[Dict]] = None):
+        self.uid = uuid.uuid4().hex
+        self.version = 0
+        self.urls: List[Optional[str]] = []
+        self.dates = array("i")
+        self.years = array("i")
+        self.vocabularies = {f: Vocabulary() for f in self.CATEGORICAL_FIELDS}
+        self.codes = {f: array("i") for f in self.CATEGORICAL_FIELDS}
+        self.skills = Vocabulary()
+        self.offsets = {f: array("q", [0]) for f in self.LIST_FIELDS}
+        self.skill_ids = {f: array("i") for f in self.LIST_FIELDS}
+        if offers:
+            self.extend(offers)
+
+    def __len__(self) -> int:
+        return len(self.urls)
+
+    def __iter__(self) -> Iterator[Dict]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def __getitem__(self, i: int) -> Dict:
+        """Decodes one offer back to the dict format produced by the collection page."""
+        offer = {
+            "title": self.vocabularies["title"].decode(self.codes["title"][i]),
+            "date": date.fromordinal(self.dates[i]) if self.dates[i] != MISSING else None,
+            "url": self.urls[i],
+        }
+        for f in self.CATEGORICAL_FIELDS[1:]:
+            offer[f] = self.vocabularies[f].decode(self.codes[f][i])
+        offer["hard_skills"] = self.skill_list("hard_skills", i)
+        offer["soft_skills"] = self.skill_list("soft_skills", i)
+        offer["years_experience_min"] = self.years[i] if self.years[i] != MISSING else None
+        offer["domains"] = self.skill_list("domains", i)
+        return offer
+
+    @property
+    def version_key(self) -> str:
+        """Changes whenever the content changes; used as a cache key for derived data."""
+        return f"{self.uid}:{self.version}"
+
+    def append(self, offer: Dict) -> None:
+        self.urls.append(offer.get("url"))
+
+        published = offer.get("date")
+        if isinstance(published, str):
+            published = date.fromisoformat(published)
+        self.dates.append(published.toordinal() if published else MISSING)
+        self.years.append(parse_years(offer.get("years_experience_min")))
+
+        for f in self.CATEGORICAL_FIELDS:
+            self.codes[f].append(self.vocabularies[f].encode(offer.get(f)))
+
+        for f in self.LIST_FIELDS:
+            ids = self.skill_ids[f]
+            for skill in offer.get(f) or []:
+                if skill is not None and str(skill).strip():
+                    ids.append(self.skills.encode(skill))
+            self.offsets[f].append(len(ids))
+
+        self.version += 1
+
+    def extend(self, offers: Iterable[Dict]) -> None:
+        for offer in offers:
+            self.append(offer)
+
+    def skill_list(self, field: str, i: int) -> List[str]:
+        offsets = self.offsets[field]
+        values = self.skills.values
+        return [values[k] for k in self.skill_ids[field][offsets[i] : offsets[i + 1]]]
+
+    def categorical(self, field: str) -> pd.Categorical:
+        """Categorical built directly from the stored codes (-1 is a missing value)."""
+        codes = as_numpy(self.codes[field])
+        return pd.Categorical.from_codes(codes, categories=self.vocabularies[field].values)
+
+    def dates_as_datetime64(self) -> np.ndarray:
+        """
+        Publication dates, NaT when unknown. The ordinals are widened to int64 before
+        inserting the NaT sentinel (int64 min), which would wrap around in int32.
+
+        >>> store = OfferStore([{"url": "a", "date": None}, {"url": "b", "date": "2024-05-02"}])
+        >>> store.dates_as_datetime64().astype(str).tolist()
+        ['NaT', '2024-05-02']
+        """
+        ordinals = as_numpy(self.dates).astype(np.int64)
+        days = np.where(ordinals == MISSING, np.iinfo(np.int64).min, ordinals - EPOCH_ORDINAL)
+        return days.view("datetime64[D]")
+
+    def to_dataframe(self, rows: Optional[np.ndarray] = None) -> pd.DataFrame:
+        """
+        DataFrame view of the store, or of the given row positions only. Categorical
+        and numeric columns are built from the stored codes without decoding strings;
+        skill columns are lists of the shared (interned) strings.
+        """
+        if not len(self):
+            return pd.DataFrame()
+        if rows is None:
+            rows = np.arange(len(self))
+
+        years = as_numpy(self.years)[rows]
+        data = {
+            "title": self.categorical("title")[rows],
+            "date": self.dates_as_datetime64()[rows],
+            "url": [self.urls[i] for i in rows],
+        }
+        for f in self.CATEGORICAL_FIELDS[1:]:
+            data[f] = self.categorical(f)[rows]
+        data["hard_skills"] = [self.skill_list("hard_skills", i) for i in rows]
+        data["soft_skills"] = [self.skill_list("soft_skills", i) for i in rows]
+        data["years_experience_min"] = pd.arrays.IntegerArray(years, years == MISSING)
+        data["domains"] = [self.skill_list("domains", i) for i in rows]
+        return pd.DataFrame(data)
+
+    def memory_usage(self) -> int:
+        """Approximate size in bytes of the stored data (strings counted once)."""
+        arrays = [self.dates, self.years, *self.codes.values(), *self.offsets.values(), *self.skill_ids.values()]
+        size = sum(a.buffer_info()[1] * a.itemsize for a in arrays)
+        size += sys.getsizeof(self.urls) + sum(sys.getsizeof(u) for u in self.urls if u)
+        vocabularies = [*self.vocabularies.values(), self.skills]
+        for v in vocabularies:
+            size += sys.getsizeof(v.values) + sys.getsizeof(v.ids)
+            size += sum(sys.getsizeof(s) for s in v.values)
+        return size
@@ -0,0 +1,83 @@
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+import zstandard
+
+# Configuration constants
+DATA_DIR = os.getenv("APP_DATA_DIR", "data")
+ARCHIVE_DIR = os.getenv("ARCHIVE_DIR", os.path.join(DATA_DIR, "archive"))
+ARCHIVE_PAGES = os.getenv("ARCHIVE_PAGES", "1") != "0"
+COMPRESSION_LEVEL = 3
+
+PAGES_FILE = "pages.zst"
+INDEX_FILE = "index.jsonl"
+
+
+class PageArchive:
+    """
+    Append-only archive of raw crawled pages.
+
+    - pages.zst: concatenated zstd frames, one per page
+    - index.jsonl: one line per page {url, kind, offset, length, fetched_at, status}
+
+    A page is written before its index line, so a crash leaves at most unindexed
+    bytes at the end of pages.zst, never an index entry pointing to a partial record.
+    Writes are serialized with a lock (detail pages are fetched by worker threads).
+    """
+
+    def __init__(self, directory: str = ARCHIVE_DIR):
+        self.directory = directory
+        self.pages_path = os.path.join(directory, PAGES_FILE)
+        self.index_path = os.path.join(directory, INDEX_FILE)
+        self._lock = threading.Lock()
+        self._compressor = zstandard.ZstdCompressor(level=COMPRESSION_LEVEL)
+
+    def append(self, url: str, content: bytes, kind: str, status: int = 200) -> None:
+        """Stores one raw page. kind: "listing" (search results) or "detail" (offer page)."""
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            frame = self._compressor.compress(content)
+            with open(self.pages_path, "ab") as f:
+                offset = f.tell()
+                f.write(frame)
+
+            entry = {
+                "url": url,
+                "kind": kind,
+                "offset": offset,
+                "length": len(frame),
+                "fetched_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "status": status,
+            }
+            with open(self.index_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+
+    def entries(self, kind: Optional[str] = None) -> List[Dict]:
+        """Index entries, latest fetch per (kind, url)."""
+        if not os.path.exists(self.index_path):
+            return []
+
+        latest: Dict = {}
+        with open(self.index_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if kind is None or entry["kind"] == kind:
+                    latest[(entry["kind"], entry["url"])] = entry
+        return list(latest.values())
+
+
+def read_page(pages_path: str, offset: int, length: int) -> bytes:
+    """
+    Reads and decompresses one archived page. A plain function of file
+    coordinates, so worker processes can read pages without receiving them.
+    """
+    with open(pages_path, "rb") as f:
+        f.seek(offset)
+        frame = f.read(length)
+    return zstandard.ZstdDecompressor().decompress(frame)
@@ -0,0 +1,87 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+from parsing import extraction_offers_from_html, parse_job_page
+
+# Configuration constants
+# 0 parses on the calling thread (no worker processes)
+PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", str(os.cpu_count() or 1)))
+CHUNKS_PER_WORKER = 4
+
+
+def parse_listing_html(html: str, today: Optional[date] = None) -> Tuple[List[Dict], int]:
+    """Worker entry point: search page in, listing offers + last page out."""
+    return extraction_offers_from_html(html, today)
+
+
+def parse_detail_bytes(content: bytes) -> Dict[str, Optional[str]]:
+    """Worker entry point: raw offer page in, mission/profile/experience out."""
+    return parse_job_page(content.decode(errors="replace"))
+
+
+class ParsePool:
+    """
+    CPU-bound BeautifulSoup parsing in worker processes, off the GIL shared by
+    the Streamlit server, the script thread and the fetch threads.
+
+    Raw bytes go in, small dicts come out; batches are submitted in chunks
+    (CHUNKS_PER_WORKER chunks per worker) to keep IPC round trips low.
+    Workers are started with "spawn": the app process runs threads, which
+    makes fork unsafe.
+    """
+
+    def __init__(self, workers: int = PARSE_WORKERS):
+        self.workers = workers
+        self._lock = threading.Lock()
+        self._executor = self._start()
+
+    def _start(self) -> Optional[ProcessPoolExecutor]:
+        if self.workers <= 0:
+            return None
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+
+    def _restart(self, broken: ProcessPoolExecutor) -> None:
+        """
+        Replaces a broken executor (a worker died, e.g. killed for memory): the pool is
+        shared by every session of the process, so it must not stay unusable.
+        """
+        with self._lock:
+            if self._executor is broken:
+                broken.shutdown(wait=False, cancel_futures=True)
+                self._executor = self._start()
+
+    def chunksize(self, n_items: int) -> int:
+        return max(1, n_items // (max(1, self.workers) * CHUNKS_PER_WORKER))
+
+    def parse_listing(self, html: str, today: Optional[date] = None) -> Tuple[List[Dict], int]:
+        executor = self._executor
+        if executor is not None:
+            try:
+                return executor.submit(parse_listing_html, html, today).result()
+            except BrokenProcessPool:
+                self._restart(executor)
+        return parse_listing_html(html, today)
+
+    def parse_details(self, contents: List[bytes]) -> List[Dict[str, Optional[str]]]:
+        """Parses offer pages in order (inline if the worker pool breaks)."""
+        executor = self._executor
+        if executor is not None and len(contents) > 1:
+            try:
+                return list(
+                    executor.map(parse_detail_bytes, contents, chunksize=self.chunksize(len(contents)))
+                )
+            except BrokenProcessPool:
+                self._restart(executor)
+        return [parse_detail_bytes(c) for c in contents]
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
@@ -0,0 +1,186 @@
+import re
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup
+
+# Configuration constants
+BASE_URL = "https://www.hellowork.com"
+# Elements that start a new line of text; inline tags (<strong>, <a>...) do not
+BLOCK_TAGS = ["p", "li", "br", "div", "ul", "ol", "tr", "h1", "h2", "h3", "h4", "h5", "h6"]
+
+
+def extract_text(
+    parent: BeautifulSoup,
+    name: str,
+    class_name: Optional[str] = None,
+    attrs: Optional[Dict[str, str]] = None,
+    multiline: bool = False,
+) -> Optional[str]:
+    """
+    Extracts cleaned text from an HTML element.
+    With multiline=True, blocks (paragraphs, list items, line breaks) are kept
+    on separate lines (see block_text).
+    Returns None if not found.
+    """
+    attrs = attrs or {}
+    elem = parent.find(name, class_=class_name, attrs=attrs)
+    if elem is None:
+        return None
+    return block_text(elem) if multiline else elem.get_text(strip=True)
+
+
+def block_text(elem) -> str:
+    r"""
+    Text of an element with one line per block. Inline tags stay within their line,
+    so a skill in <strong> is not split out of its sentence.
+
+    >>> html = "<div><p>Modèles en <strong>Python</strong>, et SQL.</p><ul><li>Spark</li><li>dbt</li></ul>Fin<br>Suite</div>"
+    >>> block_text(BeautifulSoup(html, "html.parser").div)
+    'Modèles en Python, et SQL.\nSpark\ndbt\nFin\nSuite'
+    """
+    for tag in elem.find_all(BLOCK_TAGS):
+        tag.insert_before("\n")
+        tag.insert_after("\n")
+    lines = (" ".join(line.split()) for line in elem.get_text().splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def parse_relative_date(date_string: str, today: Optional[date] = None) -> date:
+    """
+    Converts 'il y a 3 jours' to a date, relative to `today`
+    (the fetch date when re-parsing archived pages).
+    """
+    today = today or date.today()
+    days = re.findall(r"\d+", date_string)
+    return today - timedelta(days=int(days[0])) if days else today
+
+
+def parse_last_page(soup: BeautifulSoup) -> int:
+    """
+    Gets the last page number from pagination.
+    Returns 1 by default if nothing is found.
+    """
+    nav = soup.find(
+        "nav",
+        class_="tw-hidden sm:tw-flex tw-gap-2 tw-typo-m tw-flex-wrap",
+    )
+    if not nav:
+        return 1
+
+    buttons = nav.find_all("button")
+    number_buttons = [b for b in buttons if b.text.strip().isdigit()]
+    if not number_buttons:
+        return 1
+
+    last_button = number_buttons[-1]
+    return int(last_button.get_text(strip=True))
+
+
+def extraction_offers_from_html(
+    html: str,
+    today: Optional[date] = None,
+) -> Tuple[List[Dict[str, Optional[str]]], int]:
+    """
+    Extracts the list of offers + total number of pages from a HelloWork HTML page.
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    offers: List[Dict[str, Optional[str]]] = []
+
+    # Total number of pages
+    last_page = parse_last_page(soup)
+
+    # Offers list
+    offer_ul_list = soup.select('ul[aria-label="liste des offres"]')
+    if not offer_ul_list:
+        return offers, last_page
+
+    offer_ul = offer_ul_list[0]
+    for li in offer_ul.find_all("li", recursive=False):
+        offer_link = li.select_one('a[data-cy="offerTitle"]')
+        href = offer_link.get("href", "") if offer_link else ""
+        url = urljoin(BASE_URL, href) if href else None
+
+        title = extract_text(
+            li,
+            "p",
+            "tw-typo-l sm:small-group:tw-typo-l sm:tw-typo-xl",
+        )
+
+        published_date = (
+            parse_relative_date(
+                extract_text(
+                    li,
+                    "div",
+                    "tw-typo-s tw-text-grey-500 tw-pl-1 tw-pt-1",
+                ),
+                today,
+            )
+            if extract_text(
+                li,
+                "div",
+                "tw-typo-s tw-text-grey-500 tw-pl-1 tw-pt-1",
+            )
+            else None
+        )
+
+        contract_type = extract_text(
+            li,
+            "div",
+            "tw-readonly tw-tag-secondary-s tw-w-fit tw-border-0",
+            attrs={"data-cy": "contractCard"},
+        )
+        location = extract_text(
+            li,
+            "div",
+            "tw-readonly tw-tag-secondary-s tw-w-fit tw-border-0",
+            attrs={"data-cy": "localisationCard"},
+        )
+        company = extract_text(li, "p", "tw-typo-s tw-inline")
+
+        offers.append(
+            {
+                "title": title,
+                "date": published_date,
+                "url": url,
+                "contract_type": contract_type,
+                "location": location,
+                "company": company,
+            }
+        )
+
+    return offers, last_page
+
+
+def parse_job_page(html: str) -> Dict[str, Optional[str]]:
+    """
+    Extracts the mission text, searched profile and minimum experience
+    from a HelloWork offer page.
+    """
+    soup = BeautifulSoup(html, "html.parser")
+
+    mission_text = extract_text(
+        soup,
+        "div",
+        class_name="tw-leading-relaxed",
+        attrs={"data-truncate-text-target": True},
+        multiline=True,
+    )
+
+    profil_recherche = extract_text(
+        soup,
+        "p",
+        "tw-typo-long-m tw-break-words",
+        multiline=True,
+    )
+
+    ul = soup.select_one("ul.tw-flex.tw-flex-wrap.tw-gap-3")
+    experience = ul.find_all("li", recursive=False)[-1].get_text(strip=True) if ul else None
+    experience_years = re.findall(r"\d+", experience)[0] if experience and "Exp." in experience else None
+
+    return {
+        "mission": mission_text,
+        "profile": profil_recherche,
+        "experience_years": experience_years,
+    }
@@ -0,0 +1,202 @@
+import itertools
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+import httpx
+
+# Configuration constants
+# Comma-separated proxy URLs, e.g. "http://gluetun-exit-2:8888,socks5://127.0.0.1:1080".
+# Empty: a single direct egress (the default Gluetun tunnel).
+EGRESS_PROXIES = os.getenv("EGRESS_PROXIES", "")
+EGRESS_MIN_INTERVAL = float(os.getenv("EGRESS_MIN_INTERVAL", "0.5"))  # seconds between requests, per exit
+EGRESS_CONCURRENCY = int(os.getenv("EGRESS_CONCURRENCY", "2"))  # in-flight requests per exit
+EGRESS_HEALTH_URL = os.getenv("EGRESS_HEALTH_URL", "https://www.hellowork.com/robots.txt")
+MAX_CONSECUTIVE_FAILURES = 3
+EJECTION_COOLDOWN_SECONDS = 60.0
+
+# Responses that mean "this exit is blocked or broken", not "this page is bad"
+FAILURE_STATUS_CODES = {403, 407, 429}
+
+
+class NoHealthyEgress(RuntimeError):
+    pass
+
+
+class EgressBlocked(RuntimeError):
+    """A response from a blocked or failing exit (see is_egress_failure): retry later."""
+
+    def __init__(self, url: str, status_code: int):
+        super().__init__(f"HTTP {status_code} (blocked or failing exit)")
+        self.url = url
+        self.status_code = status_code
+
+
+def is_egress_failure(status_code: int) -> bool:
+    return status_code in FAILURE_STATUS_CODES or status_code >= 500
+
+
+class Egress:
+    """One exit: an HTTP client bound to a proxy (or direct), with its health and rate state."""
+
+    def __init__(self, proxy_url: Optional[str], headers: Dict[str, str], timeout: float):
+        self.proxy_url = proxy_url
+        self.client = httpx.Client(
+            proxy=proxy_url,
+            timeout=timeout,
+            follow_redirects=True,
+            headers=headers,
+        )
+        self.in_flight = 0
+        self.next_slot = 0.0
+        self.failures = 0
+        self.ejected_until = 0.0
+        self.requests = 0
+
+    @property
+    def name(self) -> str:
+        return self.proxy_url or "direct"
+
+    def is_available(self, now: float) -> bool:
+        return self.ejected_until <= now
+
+
+class ProxyPool:
+    """
+    Pool of egress proxies shared by the listing and detail fetches.
+
+    - assignment: least-loaded (fewest in-flight requests, then earliest free slot)
+      or round-robin
+    - per-exit rate limit: at most one request every `min_interval` seconds
+    - health: an exit is ejected for `cooldown` seconds after `max_failures`
+      consecutive failures (transport errors, 403/407/429, 5xx), then re-admitted
+    """
+
+    def __init__(
+        self,
+        proxy_urls: List[Optional[str]],
+        headers: Dict[str, str],
+        timeout: float = 20,
+        min_interval: float = EGRESS_MIN_INTERVAL,
+        concurrency: int = EGRESS_CONCURRENCY,
+        max_failures: int = MAX_CONSECUTIVE_FAILURES,
+        cooldown: float = EJECTION_COOLDOWN_SECONDS,
+        strategy: str = "least_loaded",
+    ):
+        if not proxy_urls:
+            proxy_urls = [None]
+        self.egresses = [Egress(url, headers, timeout) for url in proxy_urls]
+        self.min_interval = min_interval
+        self.concurrency = concurrency
+        self.max_failures = max_failures
+        self.cooldown = cooldown
+        self.strategy = strategy
+        self._round_robin = itertools.cycle(range(len(self.egresses)))
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, headers: Dict[str, str], **kwargs) -> "ProxyPool":
+        urls = [u.strip() for u in EGRESS_PROXIES.split(",") if u.strip()]
+        return cls(urls, headers, **kwargs)
+
+    @property
+    def max_workers(self) -> int:
+        """Number of concurrent requests the pool can serve."""
+        return len(self.egresses) * self.concurrency
+
+    def _pick(self, now: float) -> Optional[Egress]:
+        candidates = [e for e in self.egresses if e.is_available(now)]
+        if not candidates:
+            return None
+
+        if self.strategy == "round_robin":
+            for _ in range(len(self.egresses)):
+                egress = self.egresses[next(self._round_robin)]
+                if egress.is_available(now):
+                    return egress
+
+        return min(candidates, key=lambda e: (e.in_flight, e.next_slot))
+
+    def acquire(self) -> Egress:
+        """Reserves the next rate-limit slot on an exit and waits for it."""
+        with self._lock:
+            now = time.monotonic()
+            egress = self._pick(now)
+            if egress is None:
+                raise NoHealthyEgress("No healthy egress proxy available.")
+
+            start = max(now, egress.next_slot)
+            egress.next_slot = start + self.min_interval
+            egress.in_flight += 1
+
+        delay = start - now
+        if delay > 0:
+            time.sleep(delay)
+        return egress
+
+    def release(self, egress: Egress, ok: bool) -> None:
+        with self._lock:
+            egress.in_flight -= 1
+            egress.requests += 1
+            if ok:
+                egress.failures = 0
+                return
+
+            egress.failures += 1
+            if egress.failures >= self.max_failures:
+                egress.ejected_until = time.monotonic() + self.cooldown
+                egress.failures = 0
+
+    def get(self, url: str, **kwargs) -> httpx.Response:
+        """
+        GET through the pool. Transport errors are re-raised after being counted
+        against the exit; other errors (redirect loop, bad encoding) are re-raised
+        without counting. The exit is released in every case.
+        """
+        egress = self.acquire()
+        ok = True
+        try:
+            r = egress.client.get(url, **kwargs)
+            ok = not is_egress_failure(r.status_code)
+            return r
+        except httpx.TransportError:
+            ok = False
+            raise
+        finally:
+            self.release(egress, ok=ok)
+
+    def health_check(self, url: str = EGRESS_HEALTH_URL) -> Dict[str, bool]:
+        """Probes every exit once; failing exits are ejected immediately."""
+        status = {}
+        for egress in self.egresses:
+            try:
+                r = egress.client.get(url, timeout=10)
+                ok = r.status_code < 400
+            except httpx.HTTPError:
+                ok = False
+
+            with self._lock:
+                if ok:
+                    egress.failures = 0
+                    egress.ejected_until = 0.0
+                else:
+                    egress.ejected_until = time.monotonic() + self.cooldown
+            status[egress.name] = ok
+        return status
+
+    def stats(self) -> List[Dict]:
+        now = time.monotonic()
+        return [
+            {
+                "egress": e.name,
+                "healthy": e.is_available(now),
+                "in_flight": e.in_flight,
+                "requests": e.requests,
+            }
+            for e in self.egresses
+        ]
+
+    def close(self) -> None:
+        for egress in self.egresses:
+            egress.client.close()
@@ -0,0 +1,160 @@
+"""
+Offline re-extraction over the raw page archive (no crawling).
+
+Parses every archived offer page again with the current extraction rules,
+using all CPU cores, and writes one JSON line per offer. With --llm, the
+prepared text is also sent to Gemini with the current prompt.
+
+Usage (from the streamlit/ directory):
+    python app/reextract.py --job "Data Scientist" --output data/reextract.jsonl
+    python app/reextract.py --job "Data Scientist" --llm --output data/offers.jsonl
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import date, datetime
+from typing import Dict, List, Optional, Tuple
+
+from extraction import empty_result, llm_extract
+from page_archive import ARCHIVE_DIR, PageArchive, read_page
+from parse_pool import CHUNKS_PER_WORKER, PARSE_WORKERS
+from parsing import extraction_offers_from_html, parse_job_page
+from text_budget import DEFAULT_TOKEN_BUDGET, prepare_offer_text
+
+
+def parse_listing_entry(task: Tuple[str, Dict]) -> List[Dict]:
+    """Listing offers of one archived search page, dated relative to its fetch day."""
+    pages_path, entry = task
+    html = read_page(pages_path, entry["offset"], entry["length"]).decode(errors="replace")
+    fetched_day = datetime.fromisoformat(entry["fetched_at"]).date()
+    offers, _ = extraction_offers_from_html(html, today=fetched_day)
+    return offers
+
+
+def parse_detail_entry(task: Tuple[str, Dict]) -> Dict:
+    """Mission / profile / experience of one archived offer page."""
+    pages_path, entry = task
+    html = read_page(pages_path, entry["offset"], entry["length"]).decode(errors="replace")
+    return {"url": entry["url"], **parse_job_page(html)}
+
+
+def prepare_record(page: Dict, meta: Dict, job: str, token_budget: int) -> Optional[Dict]:
+    """Same gates as the collection page: text present and job keyword mentioned."""
+    job_offer = "\n".join(
+        f"{name}: {page[name]}" for name in ("mission", "profile") if page[name]
+    )
+    if not job_offer:
+        return None
+    if job and job.lower() not in job_offer.lower():
+        return None
+
+    llm_text, token_stats = prepare_offer_text(page["mission"], page["profile"], token_budget)
+    return {
+        **meta,
+        "url": page["url"],
+        "experience_years": page["experience_years"],
+        "llm_text": llm_text,
+        **token_stats,
+    }
+
+
+def warn(message: str) -> None:
+    print(message, file=sys.stderr)
+
+
+def _json_default(value):
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"Not JSON serializable: {type(value).__name__}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--archive", default=ARCHIVE_DIR, help="archive directory")
+    parser.add_argument("--output", required=True, help="JSONL output file")
+    parser.add_argument("--job", default="", help="keep offers mentioning this keyword (as in the app)")
+    parser.add_argument("--workers", type=int, default=PARSE_WORKERS or 1, help="parsing processes")
+    parser.add_argument("--token-budget", type=int, default=DEFAULT_TOKEN_BUDGET)
+    parser.add_argument("--llm", action="store_true", help="also run the Gemini extraction")
+    parser.add_argument("--llm-workers", type=int, default=4, help="concurrent Gemini calls")
+    args = parser.parse_args(argv)
+
+    archive = PageArchive(args.archive)
+    listings = archive.entries("listing")
+    details = archive.entries("detail")
+    if not details:
+        print(f"No archived offer pages in {args.archive}.", file=sys.stderr)
+        return 1
+
+    start = time.perf_counter()
+    # Workers get file coordinates, not page bytes: IPC stays small
+    chunksize = max(1, len(details) // (args.workers * CHUNKS_PER_WORKER))
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        listing_offers: Dict[str, Dict] = {}
+        for offers in executor.map(
+            parse_listing_entry,
+            [(archive.pages_path, e) for e in listings],
+            chunksize=max(1, len(listings) // (args.workers * CHUNKS_PER_WORKER)),
+        ):
+            for offer in offers:
+                if offer["url"]:
+                    listing_offers[offer["url"]] = offer
+
+        pages = list(
+            executor.map(
+                parse_detail_entry,
+                [(archive.pages_path, e) for e in details],
+                chunksize=chunksize,
+            )
+        )
+    parse_seconds = time.perf_counter() - start
+
+    records = []
+    for page in pages:
+        record = prepare_record(page, listing_offers.get(page["url"], {}), args.job, args.token_budget)
+        if record is not None:
+            records.append(record)
+
+    def run_llm(record: Dict) -> Dict:
+        """One offer; any error (API, quota, malformed answer) is reported, not raised."""
+        try:
+            data = llm_extract(model, record["llm_text"], record["experience_years"], record["url"], warn=warn)
+        except Exception as e:
+            warn(f"LLM extraction failed for offer {record['url']}: {e}")
+            data = None
+        return {**record, **(data or empty_result())}
+
+    if args.llm:
+        from resources import create_model
+
+        model = create_model()
+        executor = ThreadPoolExecutor(max_workers=args.llm_workers)
+        # Ordered and lazy: each record is written as soon as it is ready
+        results = executor.map(run_llm, records)
+    else:
+        executor = None
+        results = iter(records)
+
+    # Written incrementally, so an interrupted --llm run keeps the offers already done
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    try:
+        with open(args.output, "w", encoding="utf-8") as f:
+            for record in results:
+                f.write(json.dumps(record, default=_json_default, ensure_ascii=False) + "\n")
+                f.flush()
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+    print(
+        f"{len(pages)} archived offer pages parsed in {parse_seconds:.1f}s "
+        f"with {args.workers} processes; {len(records)} offers written to {args.output}."
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
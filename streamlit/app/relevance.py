@@ -0,0 +1,107 @@
+import math
+import re
+from collections import Counter
+from difflib import SequenceMatcher
+from typing import Callable, Dict, List, Optional, Tuple
+
+from normalize import fold_text
+
+# Configuration constants
+DEFAULT_SCORER = "fuzzy"
+# Off by default: skill queries ("Python") rarely appear in listing titles, only in
+# offer descriptions, so any threshold would drop offers the baseline collected.
+DEFAULT_THRESHOLD = 0.0
+NGRAM_SIZE = 3
+
+Offer = Dict[str, Optional[str]]
+
+
+def listing_text(offer: Offer) -> str:
+    """Listing data available before any detail request."""
+    return fold_text(" ".join(v for v in (offer.get("title"), offer.get("company")) if v))
+
+
+def _tokens(text: str) -> List[str]:
+    return re.findall(r"[a-z0-9+#]+", text)
+
+
+def substring_scores(query: str, texts: List[str]) -> List[float]:
+    """1.0 if the whole query appears in the text, else 0.0 (same rule as the detail-page check)."""
+    return [1.0 if query in text else 0.0 for text in texts]
+
+
+def fuzzy_scores(query: str, texts: List[str]) -> List[float]:
+    """
+    Mean over query words of the best similarity with a text word (difflib ratio),
+    so 'developpeur python' matches 'Développeur Python H/F' and tolerates typos/plurals.
+    """
+    query_tokens = _tokens(query)
+    scores = []
+    for text in texts:
+        text_tokens = _tokens(text)
+        if not query_tokens or not text_tokens:
+            scores.append(0.0)
+            continue
+        best = [
+            max(SequenceMatcher(None, q, t).ratio() for t in text_tokens)
+            for q in query_tokens
+        ]
+        scores.append(sum(best) / len(best))
+    return scores
+
+
+def _ngrams(text: str) -> Counter:
+    padded = f" {text} "
+    return Counter(padded[i : i + NGRAM_SIZE] for i in range(len(padded) - NGRAM_SIZE + 1))
+
+
+def tfidf_scores(query: str, texts: List[str]) -> List[float]:
+    """
+    Cosine similarity between character n-gram TF-IDF vectors of the query and
+    each text, IDF computed on the current listing page (no model, no network).
+    """
+    docs = [_ngrams(query)] + [_ngrams(t) for t in texts]
+    df = Counter(g for doc in docs for g in doc)
+    n_docs = len(docs)
+
+    def weigh(doc: Counter) -> Dict[str, float]:
+        return {g: tf * (math.log((1 + n_docs) / (1 + df[g])) + 1) for g, tf in doc.items()}
+
+    vectors = [weigh(doc) for doc in docs]
+    query_vec = vectors[0]
+    query_norm = math.sqrt(sum(w * w for w in query_vec.values())) or 1.0
+
+    scores = []
+    for vec in vectors[1:]:
+        norm = math.sqrt(sum(w * w for w in vec.values())) or 1.0
+        dot = sum(w * vec.get(g, 0.0) for g, w in query_vec.items())
+        scores.append(dot / (query_norm * norm))
+    return scores
+
+
+SCORERS: Dict[str, Callable[[str, List[str]], List[float]]] = {
+    "substring": substring_scores,
+    "fuzzy": fuzzy_scores,
+    "tfidf": tfidf_scores,
+}
+
+
+def filter_relevant(
+    query: str,
+    offers: List[Offer],
+    scorer: str = DEFAULT_SCORER,
+    threshold: float = DEFAULT_THRESHOLD,
+) -> Tuple[List[Offer], List[Offer]]:
+    """
+    Splits listing offers into (kept, skipped) by relevance to the query,
+    before any detail page is fetched. An empty query or a threshold of 0
+    keeps everything.
+    """
+    query = fold_text(query or "")
+    if not query or not offers or threshold <= 0:
+        return list(offers), []
+
+    scores = SCORERS[scorer](query, [listing_text(o) for o in offers])
+    kept = [o for o, s in zip(offers, scores) if s >= threshold]
+    skipped = [o for o, s in zip(offers, scores) if s < threshold]
+    return kept, skipped
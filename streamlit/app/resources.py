@@ -0,0 +1,95 @@
+import importlib
+import os
+import time
+from typing import Dict
+
+import streamlit as st
+
+# Configuration constants
+GEMINI_MODEL_NAME = "gemini-2.5-flash-lite"
+
+DEFAULT_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "fr-FR,fr;q=0.9,en;q=0.8",
+    "Accept-Encoding": "gzip, deflate",
+}
+
+# Seconds spent on first imports / resource creation in this process.
+# Streamlit re-executes page scripts on every interaction, but this module is
+# imported once, so each entry is measured once.
+STARTUP_TIMINGS: Dict[str, float] = {}
+
+
+def timed_import(name: str):
+    """importlib.import_module, recording how long the first import took."""
+    start = time.perf_counter()
+    module = importlib.import_module(name)
+    STARTUP_TIMINGS.setdefault(f"import {name}", time.perf_counter() - start)
+    return module
+
+
+class MissingApiKey(RuntimeError):
+    pass
+
+
+def create_model():
+    """
+    Gemini model client. Raises MissingApiKey when GENAI_API_KEY is not set.
+    Used directly by command-line tools; the app goes through get_model().
+    """
+    start = time.perf_counter()
+    timed_import("dotenv").load_dotenv()
+    api_key = os.getenv("GENAI_API_KEY")
+    if not api_key:
+        raise MissingApiKey("Missing GENAI_API_KEY (environment variable).")
+
+    genai = timed_import("google.generativeai")
+    genai.configure(api_key=api_key)
+    model = genai.GenerativeModel(GEMINI_MODEL_NAME)
+    STARTUP_TIMINGS["create Gemini client"] = time.perf_counter() - start
+    return model
+
+
+@st.cache_resource(show_spinner="Initializing Gemini client…")
+def get_model():
+    """
+    Gemini model client, created once per process on first use.
+    Raises MissingApiKey (not cached, so fixing .env and retrying works).
+    """
+    return create_model()
+
+
+@st.cache_resource
+def get_proxy_pool():
+    """
+    HTTP egress pool shared by all sessions, so per-exit rate limits and
+    health state hold across concurrent collections.
+    """
+    start = time.perf_counter()
+    proxy_pool = timed_import("proxy_pool")
+    pool = proxy_pool.ProxyPool.from_env(DEFAULT_HEADERS)
+    STARTUP_TIMINGS["create HTTP clients"] = time.perf_counter() - start
+    return pool
+
+
+@st.cache_resource
+def get_page_archive():
+    """Raw page archive shared by all sessions, None when ARCHIVE_PAGES=0."""
+    page_archive = timed_import("page_archive")
+    if not page_archive.ARCHIVE_PAGES:
+        return None
+    return page_archive.PageArchive()
+
+
+@st.cache_resource
+def get_parse_pool():
+    """HTML parsing worker processes, started once and shared by all sessions."""
+    start = time.perf_counter()
+    parse_pool = timed_import("parse_pool")
+    pool = parse_pool.ParsePool()
+    STARTUP_TIMINGS["start parse pool"] = time.perf_counter() - start
+    return pool
@@ -0,0 +1,164 @@
+import os
+import sqlite3
+from collections import Counter
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Set, Tuple
+
+import pandas as pd
+
+from normalize import clean_skill, experience_bucket, extract_city
+from offer_store import MISSING, parse_years
+
+# Configuration constants
+DATA_DIR = os.getenv("APP_DATA_DIR", "data")
+ROLLUP_DB_PATH = os.path.join(DATA_DIR, "rollups.sqlite")
+
+# Dimension name -> label shown in the UI. "all" counts every offer (denominator for shares).
+DIMENSIONS = {
+    "hard_skill": "Hard skill",
+    "soft_skill": "Soft skill",
+    "city": "City",
+    "contract_type": "Contract type",
+    "experience": "Experience (years)",
+}
+ALL = "all"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS daily_rollup (
+    day TEXT NOT NULL,
+    dimension TEXT NOT NULL,
+    value TEXT NOT NULL,
+    offers INTEGER NOT NULL,
+    PRIMARY KEY (dimension, value, day)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS ingested_offers (
+    url TEXT PRIMARY KEY
+) WITHOUT ROWID;
+"""
+
+
+def connect(path: str = ROLLUP_DB_PATH) -> sqlite3.Connection:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30)
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def offer_keys(offer: Dict) -> Set[Tuple[str, str]]:
+    """(dimension, value) pairs an offer counts towards; each pair counts once per offer."""
+    keys = {(ALL, "")}
+    keys.update(("hard_skill", clean_skill(s)) for s in offer.get("hard_skills") or [] if str(s).strip())
+    keys.update(("soft_skill", clean_skill(s)) for s in offer.get("soft_skills") or [] if str(s).strip())
+
+    city = extract_city(offer.get("location"))
+    if city:
+        keys.add(("city", city))
+    if offer.get("contract_type"):
+        keys.add(("contract_type", offer["contract_type"]))
+
+    years = parse_years(offer.get("years_experience_min"))
+    bucket = experience_bucket(years if years != MISSING else None)
+    if bucket:
+        keys.add(("experience", bucket))
+    return keys
+
+
+def ingest_offers(offers: Iterable[Dict], path: str = ROLLUP_DB_PATH) -> int:
+    """
+    Adds offers to the daily rollups (by publication date) in one transaction.
+    Offers already ingested (same URL) are skipped, so re-running or resuming a
+    collection never double counts. Returns the number of new offers.
+    """
+    increments: Counter = Counter()
+    new_offers = 0
+
+    conn = connect(path)
+    try:
+        with conn:
+            for offer in offers:
+                url = offer.get("url")
+                published = offer.get("date")
+                if not url or not published:
+                    continue
+
+                cursor = conn.execute("INSERT OR IGNORE INTO ingested_offers (url) VALUES (?)", (url,))
+                if cursor.rowcount == 0:
+                    continue
+
+                new_offers += 1
+                day = published.isoformat() if isinstance(published, date) else str(published)
+                for dimension, value in offer_keys(offer):
+                    increments[(day, dimension, value)] += 1
+
+            conn.executemany(
+                """
+                INSERT INTO daily_rollup (day, dimension, value, offers) VALUES (?, ?, ?, ?)
+                ON CONFLICT (dimension, value, day) DO UPDATE SET offers = offers + excluded.offers
+                """,
+                [(day, dimension, value, n) for (day, dimension, value), n in increments.items()],
+            )
+    finally:
+        conn.close()
+
+    return new_offers
+
+
+def _since(days: int) -> str:
+    return (date.today() - timedelta(days=days - 1)).isoformat()
+
+
+def top_values(dimension: str, days: int, limit: int = 50, path: str = ROLLUP_DB_PATH) -> List[str]:
+    """Most frequent values of a dimension over the last `days` days."""
+    conn = connect(path)
+    try:
+        rows = conn.execute(
+            """
+            SELECT value FROM daily_rollup
+            WHERE dimension = ? AND day >= ?
+            GROUP BY value ORDER BY SUM(offers) DESC LIMIT ?
+            """,
+            (dimension, _since(days), limit),
+        ).fetchall()
+    finally:
+        conn.close()
+    return [r[0] for r in rows]
+
+
+def daily_counts(dimension: str, value: str, days: int, path: str = ROLLUP_DB_PATH) -> pd.DataFrame:
+    """
+    Daily offers for one value and for all offers over the last `days` days,
+    one row per day (missing days filled with 0).
+    """
+    since = _since(days)
+    conn = connect(path)
+    try:
+        df = pd.read_sql_query(
+            """
+            SELECT day, dimension, offers FROM daily_rollup
+            WHERE day >= ? AND ((dimension = ? AND value = ?) OR dimension = ?)
+            """,
+            conn,
+            params=(since, dimension, value, ALL),
+        )
+    finally:
+        conn.close()
+
+    index = pd.date_range(since, date.today(), freq="D")
+    df["day"] = pd.to_datetime(df["day"])
+    wide = df.pivot_table(index="day", columns="dimension", values="offers", aggfunc="sum")
+    wide = wide.reindex(index=index, columns=[dimension, ALL]).fillna(0).astype(int)
+    wide.columns.name = None
+    return wide.rename(columns={dimension: "offers", ALL: "all_offers"})
+
+
+def summary(path: str = ROLLUP_DB_PATH) -> Dict:
+    """Number of ingested offers and covered date range."""
+    conn = connect(path)
+    try:
+        total, first_day, last_day = conn.execute(
+            "SELECT SUM(offers), MIN(day), MAX(day) FROM daily_rollup WHERE dimension = ?",
+            (ALL,),
+        ).fetchone()
+    finally:
+        conn.close()
+    return {"offers": total or 0, "first_day": first_day, "last_day": last_day}
@@ -0,0 +1,147 @@
+import math
+import re
+from typing import Dict, List, Optional, Tuple
+
+from normalize import fold_text
+
+# Configuration constants
+DEFAULT_TOKEN_BUDGET = 512
+CHARS_PER_TOKEN = 4  # rough average for French/English text with Gemini tokenizers
+MIN_TRUNCATED_TOKENS = 16  # an overflowing sentence is cut only if this much room is left
+MIN_DEDUP_WORDS = 3  # shorter lines ("Python", "SQL") are list items, not repeated sentences
+
+# Sentences about the company, benefits, hiring process or legal notices (accent-folded)
+BOILERPLATE_PATTERNS = re.compile(
+    r"avantages?|ticket|mutuelle|\brtt\b|\bprimes?\b|remuneration|salaire|package|"
+    r"comite d.entreprise|\bcse\b|egalite des chances|handicap|diversite|discrimination|"
+    r"rgpd|donnees personnelles|conformement|processus de recrutement|"
+    r"postule[rz]|candidature|rejoignez|nous rejoindre|qui sommes.nous|notre groupe|"
+    r"fondee? en|chiffre d.affaires|"
+    r"benefits|equal opportunit|apply|about us"
+)
+
+# Sentences likely to carry skills, tools or experience requirements (accent-folded)
+SKILL_PATTERNS = re.compile(
+    r"competence|maitris|connaissance|experience|savoir|outil|langage|technolog|"
+    r"framework|logiciel|methodolog|certifi|diplome|bac\s*\+|formation|anglais|"
+    r"\d+\s*ans?\b|years?|skills?|knowledge|proficien"
+)
+ACRONYM = re.compile(r"\b[A-Z][A-Z0-9+#.]{1,}\b")
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def split_sentences(text: str) -> List[str]:
+    parts = re.split(r"(?<=[.!?;])\s+|\s*\n+\s*|\s+[•·▪]\s*", text or "")
+    return [p.strip(" -•·▪\t") for p in parts if p and p.strip(" -•·▪\t")]
+
+
+def is_skill_bearing(sentence: str) -> bool:
+    """Skill vocabulary, or an acronym such as SQL / AWS / SAP"""
+    return bool(SKILL_PATTERNS.search(fold_text(sentence)) or ACRONYM.search(sentence))
+
+
+def is_boilerplate(sentence: str) -> bool:
+    """Boilerplate wording with no skill vocabulary (acronyms like RTT / RGPD do not count)"""
+    folded = fold_text(sentence)
+    return bool(BOILERPLATE_PATTERNS.search(folded)) and not SKILL_PATTERNS.search(folded)
+
+
+def truncate_to_tokens(text: str, tokens: int) -> str:
+    """Cuts text to about `tokens` tokens, at a word boundary when possible."""
+    limit = tokens * CHARS_PER_TOKEN
+    if len(text) <= limit:
+        return text
+    cut = text[: limit - 1]
+    space = cut.rfind(" ")
+    return (cut[:space] if space > limit // 2 else cut).rstrip(" ,;:") + "…"
+
+
+def prepare_offer_text(
+    mission: Optional[str],
+    profile: Optional[str],
+    token_budget: int = DEFAULT_TOKEN_BUDGET,
+) -> Tuple[str, Dict[str, int]]:
+    r"""
+    Builds the text sent to the LLM from the mission and profile sections:
+    - repeated sentences (whole sentences of MIN_DEDUP_WORDS words or more) are kept once
+    - boilerplate sentences are dropped
+    - within the budget, skill-bearing sentences come first, then the profile,
+      then the rest of the mission; kept sentences stay in their original order
+    - the first sentence that overflows the budget is truncated rather than dropped
+      (a mission without list separators can be one very long sentence)
+
+    Returns (text, {"tokens_before", "tokens_after", "tokens_saved", "skill_tokens_dropped"}),
+    where tokens_before is the estimate for the verbatim "mission/profile" text.
+    Skill-bearing text cut for lack of budget is reported in skill_tokens_dropped,
+    not counted as saved.
+
+    Skills in inline tags appearing in both sections are kept in both:
+
+    >>> from parsing import parse_job_page
+    >>> page = parse_job_page(
+    ...     '<div class="tw-leading-relaxed" data-truncate-text-target="t">'
+    ...     '<p>Vous construirez des modèles en <strong>Python</strong>.</p></div>'
+    ...     '<p class="tw-typo-long-m tw-break-words">Expérience de 3 ans en <strong>Python</strong> exigée.</p>'
+    ... )
+    >>> prepare_offer_text(page["mission"], page["profile"])[0]
+    'mission: Vous construirez des modèles en Python.\nprofile: Expérience de 3 ans en Python exigée.'
+    """
+    sections = [("mission", mission), ("profile", profile)]
+    verbatim = "\n".join(f"{name}: {text}" for name, text in sections if text)
+
+    candidates = []  # (priority, section index, position, sentence)
+    seen = set()
+    for s_idx, (name, text) in enumerate(sections):
+        for pos, sentence in enumerate(split_sentences(text)):
+            if len(sentence.split()) >= MIN_DEDUP_WORDS:
+                key = fold_text(sentence)
+                if key in seen:
+                    continue
+                seen.add(key)
+
+            if is_boilerplate(sentence):
+                continue
+            priority = 0 if is_skill_bearing(sentence) else (1 if name == "profile" else 2)
+            candidates.append((priority, s_idx, pos, sentence))
+
+    kept = []
+    skill_dropped = 0
+    used = sum(estimate_tokens(f"{name}: ") for name, text in sections if text)
+    for candidate in sorted(candidates):
+        priority, s_idx, pos, sentence = candidate
+        cost = estimate_tokens(sentence) + 1
+        if used + cost > token_budget:
+            room = token_budget - used - 1
+            if room >= MIN_TRUNCATED_TOKENS:
+                truncated = truncate_to_tokens(sentence, room)
+                kept.append((priority, s_idx, pos, truncated))
+                used += estimate_tokens(truncated) + 1
+                cost -= estimate_tokens(truncated) + 1
+            if priority == 0:
+                skill_dropped += cost
+            continue
+        kept.append(candidate)
+        used += cost
+
+    kept.sort(key=lambda c: (c[1], c[2]))
+    lines = []
+    for s_idx, (name, _) in enumerate(sections):
+        sentences = [c[3] for c in kept if c[1] == s_idx]
+        if sentences:
+            lines.append(f"{name}: " + " ".join(sentences))
+    text = "\n".join(lines)
+    if not text:
+        # Nothing recognizable: fall back to the verbatim text, truncated
+        text = verbatim[: token_budget * CHARS_PER_TOKEN]
+
+    before = estimate_tokens(verbatim)
+    after = estimate_tokens(text)
+    return text, {
+        "tokens_before": before,
+        "tokens_after": after,
+        "tokens_saved": max(0, before - after - skill_dropped),
+        "skill_tokens_dropped": skill_dropped,
+    }